@@ -209,7 +209,7 @@ def check_validity(**context) -> Dict[str, Any]:
             'price_positive': "SELECT COUNT(*) FROM products WHERE price <= 0",
             'order_amount_positive': "SELECT COUNT(*) FROM orders WHERE total_amount <= 0",
             'quantity_positive': "SELECT COUNT(*) FROM orders WHERE quantity <= 0",
-            'email_format': "SELECT COUNT(*) FROM customers WHERE email NOT LIKE '%@%.%'",
+            'email_format': "SELECT COUNT(*) FROM customers WHERE NOT email_valid",
             'future_dates': "SELECT COUNT(*) FROM orders WHERE order_date > CURRENT_TIMESTAMP",
         }
 
@@ -269,13 +269,15 @@ def check_consistency(**context) -> Dict[str, Any]:
         checks = {
             'customer_fk': """
                 SELECT COUNT(*) FROM orders o
-                LEFT JOIN customers c ON o.customer_id = c.customer_id
-                WHERE c.customer_id IS NULL
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM customers c WHERE c.customer_id = o.customer_id
+                )
             """,
             'product_fk': """
                 SELECT COUNT(*) FROM orders o
-                LEFT JOIN products p ON o.product_id = p.product_id
-                WHERE p.product_id IS NULL
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM products p WHERE p.product_id = o.product_id
+                )
             """,
             'calculation_accuracy': """
                 SELECT COUNT(*) FROM orders o
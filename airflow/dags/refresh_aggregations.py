@@ -115,14 +115,14 @@ def refresh_customer_summary(**context) -> Dict[str, Any]:
             c.customer_id,
             c.customer_name,
             c.email,
-            COUNT(DISTINCT o.order_id) as total_orders,
+            COUNT(o.order_id) as total_orders,
             SUM(o.total_amount) as total_spent,
             AVG(o.total_amount) as avg_order_value,
             MAX(o.order_date) as last_purchase_date,
             MIN(o.order_date) as first_purchase_date,
             ROUND(
                 (CURRENT_DATE - MAX(o.order_date))::numeric / 
-                NULLIF(COUNT(DISTINCT o.order_id), 0), 2
+                NULLIF(COUNT(o.order_id), 0), 2
             ) as days_since_purchase
         FROM customers c
         LEFT JOIN orders o ON c.customer_id = o.customer_id 
@@ -187,7 +187,7 @@ def refresh_product_summary(**context) -> Dict[str, Any]:
             p.category,
             p.price,
             COUNT(o.order_id) as total_units_sold,
-            COUNT(DISTINCT o.order_id) as total_orders,
+            COUNT(o.order_id) as total_orders,
             SUM(o.quantity) as quantity_sold,
             SUM(o.total_amount) as total_revenue,
             ROUND(SUM(o.total_amount) / NULLIF(SUM(o.quantity), 0), 2) as avg_price_sold,
@@ -321,26 +321,32 @@ def refresh_monthly_sales(**context) -> Dict[str, Any]:
         TRUNCATE TABLE monthly_sales_summary;
         
         INSERT INTO monthly_sales_summary 
+        WITH monthly AS (
+            SELECT
+                DATE_TRUNC('month', o.order_date)::date as month,
+                COUNT(o.order_id) as total_orders,
+                COUNT(DISTINCT o.customer_id) as unique_customers,
+                SUM(o.total_amount) as total_revenue,
+                ROUND(AVG(o.total_amount), 2) as avg_order_value,
+                SUM(o.quantity) as total_units
+            FROM orders o
+            WHERE o.order_status = 'Delivered'
+            GROUP BY 1
+        )
         SELECT
-            DATE_TRUNC('month', o.order_date)::date as month,
-            COUNT(o.order_id) as total_orders,
-            COUNT(DISTINCT o.customer_id) as unique_customers,
-            SUM(o.total_amount) as total_revenue,
-            ROUND(AVG(o.total_amount), 2) as avg_order_value,
-            SUM(o.quantity) as total_units,
-            LAG(SUM(o.total_amount)) OVER (
-                ORDER BY DATE_TRUNC('month', o.order_date)
-            ) as prev_month_revenue,
+            month,
+            total_orders,
+            unique_customers,
+            total_revenue,
+            avg_order_value,
+            total_units,
+            LAG(total_revenue) OVER w as prev_month_revenue,
             ROUND(
-                (SUM(o.total_amount) - LAG(SUM(o.total_amount)) OVER (
-                    ORDER BY DATE_TRUNC('month', o.order_date)
-                )) / NULLIF(LAG(SUM(o.total_amount)) OVER (
-                    ORDER BY DATE_TRUNC('month', o.order_date)
-                ), 0) * 100, 2
+                (total_revenue - LAG(total_revenue) OVER w)
+                / NULLIF(LAG(total_revenue) OVER w, 0) * 100, 2
             ) as mom_growth_pct
-        FROM orders o
-        WHERE o.order_status = 'Delivered'
-        GROUP BY DATE_TRUNC('month', o.order_date)
+        FROM monthly
+        WINDOW w AS (ORDER BY month)
         ORDER BY month DESC;
         """
 
@@ -0,0 +1,18 @@
+-- ========================================
+-- MIGRATION: customers.email_valid
+-- ========================================
+-- Purpose: Add the generated email-format column the quality checks
+--          (data_quality_checks.py, daily_quality_check DAG) read, to
+--          databases created before it was part of create_schema.sql
+-- Author: Abhiiram
+-- Date: November 7, 2025
+-- ========================================
+-- Idempotent: safe to re-run, and a no-op on a fresh schema. Adding a
+-- STORED column rewrites customers once, under an exclusive lock.
+-- ========================================
+ALTER TABLE customers
+    ADD COLUMN IF NOT EXISTS email_valid BOOLEAN
+    GENERATED ALWAYS AS (email LIKE '%@%.%') STORED;
+-- The quality checks count NOT email_valid in a full-table pass, which
+-- never used this partial index
+DROP INDEX IF EXISTS idx_customers_invalid_email;
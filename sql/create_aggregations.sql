@@ -51,7 +51,7 @@ SELECT p.product_id,
     p.brand,
     p.price,
     COUNT(o.order_id) AS times_sold,
-    COUNT(DISTINCT o.order_id) AS total_orders,
+    COUNT(o.order_id) AS total_orders,
     COALESCE(SUM(o.quantity), 0) AS total_units_sold,
     COALESCE(SUM(o.total_amount), 0) AS total_revenue,
     COUNT(DISTINCT o.customer_id) AS unique_customers,
@@ -94,37 +94,44 @@ CREATE INDEX idx_daily_sales_revenue ON daily_sales_summary(total_revenue DESC);
 -- 4. MONTHLY SALES SUMMARY TABLE
 -- ========================================
 DROP TABLE IF EXISTS monthly_sales_summary CASCADE;
-CREATE TABLE monthly_sales_summary AS
-SELECT DATE_TRUNC('month', o.order_date)::DATE AS month,
-    COUNT(o.order_id) AS total_orders,
-    COUNT(DISTINCT o.customer_id) AS unique_customers,
-    COALESCE(SUM(o.total_amount), 0) AS total_revenue,
-    ROUND(COALESCE(AVG(o.total_amount), 0), 2) AS avg_order_value,
-    COALESCE(SUM(o.quantity), 0) AS total_units,
-    LAG(SUM(o.total_amount)) OVER (
-        ORDER BY DATE_TRUNC('month', o.order_date)
-    ) AS prev_month_revenue,
+CREATE TABLE monthly_sales_summary AS WITH monthly AS (
+    SELECT DATE_TRUNC('month', o.order_date)::DATE AS month,
+        COUNT(o.order_id) AS total_orders,
+        COUNT(DISTINCT o.customer_id) AS unique_customers,
+        COALESCE(SUM(o.total_amount), 0) AS total_revenue,
+        ROUND(COALESCE(AVG(o.total_amount), 0), 2) AS avg_order_value,
+        COALESCE(SUM(o.quantity), 0) AS total_units
+    FROM orders o
+    WHERE o.order_status = 'Delivered'
+    GROUP BY 1
+)
+SELECT month,
+    total_orders,
+    unique_customers,
+    total_revenue,
+    avg_order_value,
+    total_units,
+    LAG(total_revenue) OVER w AS prev_month_revenue,
     ROUND(
-        (
-            SUM(o.total_amount) - LAG(SUM(o.total_amount)) OVER (
-                ORDER BY DATE_TRUNC('month', o.order_date)
-            )
-        ) / NULLIF(
-            LAG(SUM(o.total_amount)) OVER (
-                ORDER BY DATE_TRUNC('month', o.order_date)
-            ),
-            0
-        ) * 100,
+        (total_revenue - LAG(total_revenue) OVER w) / NULLIF(LAG(total_revenue) OVER w, 0) * 100,
         2
     ) AS mom_growth_pct,
     CURRENT_TIMESTAMP AS last_updated
-FROM orders o
-WHERE o.order_status = 'Delivered'
-GROUP BY DATE_TRUNC('month', o.order_date)
+FROM monthly WINDOW w AS (
+        ORDER BY month
+    )
 ORDER BY month DESC;
 CREATE INDEX idx_monthly_sales_month ON monthly_sales_summary(month DESC);
 CREATE INDEX idx_monthly_sales_revenue ON monthly_sales_summary(total_revenue DESC);
 -- ========================================
+-- 5. REFRESH STATE (INCREMENTAL WATERMARKS)
+-- ========================================
+DROP TABLE IF EXISTS refresh_state;
+CREATE TABLE refresh_state (
+    table_name VARCHAR(100) PRIMARY KEY,
+    last_refreshed_at TIMESTAMP NOT NULL
+);
+-- ========================================
 -- VERIFICATION QUERIES
 -- ========================================
 SELECT 'Aggregate tables created!' AS status;
@@ -0,0 +1,26 @@
+-- ========================================
+-- INDEXES FOR ANOMALY DETECTION
+-- ========================================
+-- Purpose: Let the orders-based detectors in detect_anomalies.py run
+--          as index-only scans over delivered orders
+-- Author: Abhiiram
+-- Date: November 7, 2025
+-- ========================================
+-- Built CONCURRENTLY so this can be applied to a live database without
+-- blocking loads; run it outside a transaction (psql < file is fine).
+-- ========================================
+-- Order amount outliers (stats + ORDER BY total_amount DESC LIMIT 5)
+-- and the > ₹2 Lakh business rule
+-- ========================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_delivered_amount
+    ON orders(total_amount) INCLUDE (order_id)
+    WHERE order_status = 'Delivered';
+-- ========================================
+-- Quantity outliers (quantity > 5 ORDER BY quantity DESC LIMIT 5)
+-- ========================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_delivered_quantity
+    ON orders(quantity) INCLUDE (order_id, product_id)
+    WHERE order_status = 'Delivered';
+-- No index for the zero-revenue rule: CHECK (total_amount > 0) on orders
+-- already guarantees it finds nothing.
+ANALYZE orders;
@@ -0,0 +1,27 @@
+-- ========================================
+-- INDEXES FOR INCREMENTAL AGGREGATE REFRESHES
+-- ========================================
+-- Purpose: Add the orders indexes refresh_aggregations.py relies on to
+--          databases created before they were part of create_schema.sql
+-- Author: Abhiiram
+-- Date: November 7, 2025
+-- ========================================
+-- Built CONCURRENTLY so this can be applied to a live database without
+-- blocking loads; run it outside a transaction (psql < file is fine).
+-- A no-op on a fresh schema.
+-- ========================================
+-- Changed-key lookups (created_at / updated_at > last watermark) and the
+-- MAX() reads that set the next watermark
+-- ========================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_created_at
+    ON orders(created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_updated_at
+    ON orders(updated_at);
+-- ========================================
+-- Covering index for the summaries (all filter on Delivered)
+-- ========================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_delivered
+    ON orders(order_date)
+    INCLUDE (order_id, customer_id, product_id, quantity, total_amount)
+    WHERE order_status = 'Delivered';
+ANALYZE orders;
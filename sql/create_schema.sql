@@ -27,6 +27,9 @@ CREATE TABLE customers (
         AND age <= 120
     ),
     gender VARCHAR(20),
+    -- Basic email format, computed on write for the quality checks
+    -- (existing databases: sql/add_customer_email_valid.sql)
+    email_valid BOOLEAN GENERATED ALWAYS AS (email LIKE '%@%.%') STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -75,6 +78,17 @@ CREATE INDEX idx_orders_product_id ON orders(product_id);
 CREATE INDEX idx_orders_order_date ON orders(order_date);
 CREATE INDEX idx_orders_status ON orders(order_status);
 CREATE INDEX idx_orders_total_amount ON orders(total_amount);
+CREATE INDEX idx_orders_created_at ON orders(created_at);
+CREATE INDEX idx_orders_updated_at ON orders(updated_at);
+-- Covering index for the aggregate refreshes (all filter on Delivered)
+CREATE INDEX idx_orders_delivered ON orders(order_date) INCLUDE (
+    order_id,
+    customer_id,
+    product_id,
+    quantity,
+    total_amount
+)
+WHERE order_status = 'Delivered';
 -- ========================================
 -- VERIFICATION QUERIES
 -- ========================================
@@ -128,7 +128,7 @@ ORDER BY month DESC;
 -- VIEW 6: Category Performance Analysis
 CREATE OR REPLACE VIEW category_performance AS
 SELECT p.category,
-    COUNT(DISTINCT o.order_id) AS total_orders,
+    COUNT(o.order_id) AS total_orders,
     COUNT(DISTINCT o.customer_id) AS unique_customers,
     SUM(o.total_amount) AS category_revenue,
     ROUND(AVG(o.total_amount), 2) AS avg_order_value,
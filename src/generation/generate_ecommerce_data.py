@@ -26,7 +26,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
 # Configure logging
 logger.add(
     f"{Config.LOGS_DIR}/generation_{{time:YYYY-MM-DD}}.log",
-    level=Config.LOG_LEVEL
+    level=Config.LOG_LEVEL,
+    enqueue=True
 )
 
 # ========================================
@@ -43,6 +44,7 @@ RANDOM_SEED = int(os.getenv('RANDOM_SEED', int(time.time()) % 100000))
 Faker.seed(RANDOM_SEED)
 np.random.seed(RANDOM_SEED)
 random.seed(RANDOM_SEED)
+rng = np.random.default_rng(RANDOM_SEED)
 
 # Data generation parameters from config
 NUM_CUSTOMERS = Config.NUM_CUSTOMERS
@@ -81,9 +83,23 @@ PRODUCT_CATEGORIES = {
     'Home & Kitchen': ['Furniture', 'Kitchen Appliances', 'Home Decor', 'Bedding', 'Storage']
 }
 
+# Order distributions (hour of day, quantity, payment, status)
+ORDER_HOUR_WEIGHTS = [2, 1, 1, 1, 2, 3, 5, 7, 8, 10, 12, 15,
+                      18, 20, 22, 24, 20, 25, 30, 35, 30, 25, 20, 15]
+ORDER_QUANTITIES = [1, 2, 3, 4, 5]
+ORDER_QUANTITY_WEIGHTS = [50, 25, 15, 7, 3]
+PAYMENT_METHODS = ['UPI', 'Credit Card',
+                   'Debit Card', 'Cash on Delivery', 'Net Banking']
+PAYMENT_WEIGHTS = [0.50, 0.20, 0.15, 0.10, 0.05]
+ORDER_STATUSES = ['Delivered', 'Shipped', 'Processing', 'Cancelled']
+ORDER_STATUS_WEIGHTS = [0.75, 0.15, 0.05, 0.05]
+
 # Output directory
 RAW_DATA_DIR = Config.DATA_RAW_DIR
 
+# Minimum seconds between progress messages inside generation loops
+PROGRESS_INTERVAL_SECONDS = 1.0
+
 logger.info("=" * 60)
 logger.info("E-COMMERCE DATA GENERATOR")
 logger.info("=" * 60)
@@ -127,6 +143,7 @@ def generate_customers(num_customers=NUM_CUSTOMERS):
     print(f" → Creating {num_customers:,} customer records...")
 
     customers = []
+    last_progress = time.monotonic()
 
     for i in range(num_customers):
         # UNIQUE ID: offset by seed
@@ -160,7 +177,8 @@ def generate_customers(num_customers=NUM_CUSTOMERS):
 
         customers.append(customer)
 
-        if (i + 1) % 2000 == 0:
+        if time.monotonic() - last_progress > PROGRESS_INTERVAL_SECONDS:
+            last_progress = time.monotonic()
             logger.info(f"  → Generated {i + 1:,} customers...")
             print(f" → Generated {i + 1:,} customers...")
 
@@ -276,7 +294,7 @@ def generate_orders(customers_df, products_df, num_orders=NUM_ORDERS):
 
     orders = []
 
-    customer_ids = customers_df['customer_id'].tolist()
+    customer_ids = customers_df['customer_id'].to_numpy()
     product_data = products_df[['product_id',
                                 'price', 'category']].to_dict('records')
 
@@ -291,52 +309,56 @@ def generate_orders(customers_df, products_df, num_orders=NUM_ORDERS):
     regular_orders = int(num_orders * 0.4)
     occasional_orders = num_orders - vip_orders - regular_orders
 
-    customer_order_distribution = (
-        [random.choice(vip_customers) for _ in range(vip_orders)] +
-        [random.choice(regular_customers) for _ in range(regular_orders)] +
-        [random.choice(occasional_customers) for _ in range(occasional_orders)]
-    )
+    # One vectorized draw per segment instead of one call per order
+    customer_order_distribution = np.concatenate([
+        rng.choice(vip_customers, size=vip_orders),
+        rng.choice(regular_customers, size=regular_orders),
+        rng.choice(occasional_customers, size=occasional_orders)
+    ])
 
-    random.shuffle(customer_order_distribution)
+    rng.shuffle(customer_order_distribution)
 
     # UNIQUE ID: offset by seed
     order_id_counter = ORDER_ID_OFFSET + 3001
 
+    # Draw every per-order column up front: one batched choices() call
+    # per column instead of one scalar call per order
+    days_range = (END_DATE - START_DATE).days
+    order_products = random.choices(product_data, k=num_orders)
+    order_quantities = random.choices(
+        ORDER_QUANTITIES, weights=ORDER_QUANTITY_WEIGHTS, k=num_orders)
+    order_hours = random.choices(
+        range(24), weights=ORDER_HOUR_WEIGHTS, k=num_orders)
+    order_payment_methods = random.choices(
+        PAYMENT_METHODS, weights=PAYMENT_WEIGHTS, k=num_orders)
+    order_status_column = random.choices(
+        ORDER_STATUSES, weights=ORDER_STATUS_WEIGHTS, k=num_orders)
+
     for i in range(num_orders):
         order_id = order_id_counter
         order_id_counter += 1
 
         customer_id = customer_order_distribution[i]
 
-        days_range = (END_DATE - START_DATE).days
         random_days = random.randint(0, days_range)
         order_date = START_DATE + timedelta(days=random_days)
 
-        hour_weights = [2, 1, 1, 1, 2, 3, 5, 7, 8, 10, 12, 15,
-                        18, 20, 22, 24, 20, 25, 30, 35, 30, 25, 20, 15]
-        order_hour = random.choices(range(24), weights=hour_weights)[0]
+        order_hour = order_hours[i]
         order_minute = random.randint(0, 59)
         order_second = random.randint(0, 59)
 
         order_datetime = order_date.replace(
             hour=order_hour, minute=order_minute, second=order_second)
 
-        product = random.choice(product_data)
+        product = order_products[i]
         product_id = product['product_id']
         unit_price = product['price']
 
-        quantity = random.choices(
-            [1, 2, 3, 4, 5], weights=[50, 25, 15, 7, 3])[0]
+        quantity = order_quantities[i]
         total_amount = round(quantity * unit_price, 2)
 
-        payment_methods = ['UPI', 'Credit Card',
-                           'Debit Card', 'Cash on Delivery', 'Net Banking']
-        payment_method = random.choices(payment_methods, weights=[
-                                        0.50, 0.20, 0.15, 0.10, 0.05])[0]
-
-        order_statuses = ['Delivered', 'Shipped', 'Processing', 'Cancelled']
-        order_status = random.choices(order_statuses, weights=[
-                                      0.75, 0.15, 0.05, 0.05])[0]
+        payment_method = order_payment_methods[i]
+        order_status = order_status_column[i]
 
         order = {
             'order_id': order_id,
@@ -352,10 +374,6 @@ def generate_orders(customers_df, products_df, num_orders=NUM_ORDERS):
 
         orders.append(order)
 
-        if (i + 1) % 5000 == 0:
-            logger.info(f"  → Generated {i + 1:,} orders...")
-            print(f" → Generated {i + 1:,} orders...")
-
     orders_df = pd.DataFrame(orders)
     logger.info(f"✓ Generated {len(orders_df):,} orders")
     print(f" ✓ Successfully generated {len(orders_df):,} orders")
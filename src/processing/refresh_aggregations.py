@@ -1,19 +1,28 @@
 """
-Refresh Aggregation Tables (Simple Truncate Mode)
-==================================================
+Refresh Aggregation Tables (Incremental Mode)
+=============================================
 
 Refresh all aggregate tables with cumulative data.
-Aggregates are recalculated fresh from base tables.
+Only the summary rows touched by base-table changes since the last
+refresh are recalculated; the first run (or a full refresh) rebuilds
+every row from the base tables.
+
+Changes are found through created_at / updated_at, so deleted rows
+(including ON DELETE CASCADE from customers/products) and orders moved
+to another customer, product or date leave the old summary rows stale
+until a full refresh (AGGREGATION_FULL_REFRESH=true). The
+refresh_aggregations DAG rebuilds every summary in full each night.
 
 Author: Abhiiram
 Date: November 7, 2025
 """
 
-from src.utils.db_connector import get_connection
+from src.utils.db_connector import pooled_connection, close_pool, vacuum_analyze
 from src.utils.config import Config
 import psycopg2
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from loguru import logger
 
@@ -22,241 +31,484 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
 
 logger.add(
     f"{Config.LOGS_DIR}/aggregations_{{time:YYYY-MM-DD}}.log",
-    level=Config.LOG_LEVEL
+    level=Config.LOG_LEVEL,
+    enqueue=True
 )
 
 
-def refresh_customer_summary():
-    """Refresh customer summary - recalculate from base tables."""
+def configure_refresh_session(cursor) -> None:
+    """Give one refresh transaction room for large, parallel aggregations."""
+    cursor.execute("SET LOCAL work_mem = %s", (Config.AGGREGATION_WORK_MEM,))
+    cursor.execute("SET LOCAL max_parallel_workers_per_gather = %s",
+                   (Config.AGGREGATION_PARALLEL_WORKERS,))
 
-    logger.info("⏳ Refreshing customer_summary...")
-    print("⏳ Refreshing customer_summary...")
 
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
+# ========================================
+# REFRESH WATERMARKS
+# ========================================
 
-        # TRUNCATE - clear old aggregates
-        cursor.execute("DELETE FROM customer_summary")
-
-        # INSERT fresh calculations from ALL base data
-        query = """
-        INSERT INTO customer_summary 
-        SELECT 
-            c.customer_id,
-            c.first_name || ' ' || c.last_name AS customer_name,
-            c.email,
-            c.city,
-            c.state,
-            COUNT(o.order_id) AS total_orders,
-            COALESCE(SUM(o.total_amount), 0) AS total_spent,
-            COALESCE(AVG(o.total_amount), 0) AS avg_order_value,
-            MIN(o.order_date) AS first_purchase_date,
-            MAX(o.order_date) AS last_purchase_date,
-            CURRENT_DATE - MAX(o.order_date)::DATE AS days_since_last_order,
-            COUNT(DISTINCT o.product_id) AS unique_products_purchased,
-            CASE
-                WHEN MAX(o.order_date) >= CURRENT_DATE - INTERVAL '30 days' THEN 'Active'
-                WHEN MAX(o.order_date) >= CURRENT_DATE - INTERVAL '90 days' THEN 'At Risk'
-                ELSE 'Churned'
-            END AS customer_status,
-            CURRENT_TIMESTAMP AS last_updated
-        FROM customers c
-        LEFT JOIN orders o ON c.customer_id = o.customer_id 
-            AND o.order_status = 'Delivered'
-        GROUP BY c.customer_id, c.first_name, c.last_name, c.email, c.city, c.state
-        ORDER BY total_spent DESC
-        """
-
-        cursor.execute(query)
-        conn.commit()
 
-        count = cursor.rowcount
-        logger.info(f"✓ Refreshed customer_summary: {count} records")
-        print(f"✓ Refreshed customer_summary: {count} records")
+def ensure_refresh_state() -> None:
+    """
+    Create the refresh_state table if it is missing.
+
+    The orders indexes the refreshes rely on ship with create_schema.sql
+    (existing databases: sql/create_refresh_indexes.sql).
+    """
 
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS refresh_state (
+                table_name VARCHAR(100) PRIMARY KEY,
+                last_refreshed_at TIMESTAMP NOT NULL
+            )
+        """)
+        conn.commit()
         cursor.close()
-        conn.close()
+
+
+def get_refresh_watermark(cursor, table_name: str):
+    """
+    Return when table_name was last refreshed.
+
+    Returns:
+        datetime or None: None if the table has never been refreshed
+    """
+    cursor.execute(
+        "SELECT last_refreshed_at FROM refresh_state WHERE table_name = %s",
+        (table_name,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+# Base-table timestamp columns each summary's incremental refresh reads
+REFRESH_SOURCES = {
+    'customer_summary': [('orders', 'created_at'),
+                         ('orders', 'updated_at'),
+                         ('customers', 'created_at'),
+                         ('customers', 'updated_at')],
+    'product_summary': [('orders', 'created_at'),
+                        ('orders', 'updated_at'),
+                        ('products', 'created_at'),
+                        ('products', 'updated_at')],
+    'daily_sales_summary': [('orders', 'created_at'),
+                            ('orders', 'updated_at')],
+    'monthly_sales_summary': [('orders', 'created_at'),
+                              ('orders', 'updated_at')],
+}
+
+
+def next_refresh_watermark(cursor, table_name: str):
+    """
+    Work out the watermark to store once table_name's refresh commits.
+
+    Call before the refresh reads any rows: the newest created_at /
+    updated_at visible now, minus Config.AGGREGATION_WATERMARK_OVERLAP_MINUTES.
+    created_at is the inserting transaction's start time, so a load still
+    in flight can commit rows stamped below that maximum; the overlap makes
+    the next refresh look back far enough to pick them up. Rows refreshed
+    twice are harmless - each refresh rebuilds the summary rows it touches.
+
+    Returns:
+        datetime: -infinity while the source tables are empty
+    """
+    newest = ", ".join(f"(SELECT MAX({column}) FROM {table})"
+                       for table, column in REFRESH_SOURCES[table_name])
+    cursor.execute(f"""
+        SELECT COALESCE(GREATEST({newest}) - make_interval(mins => %s),
+                        '-infinity'::timestamp)
+    """, (Config.AGGREGATION_WATERMARK_OVERLAP_MINUTES,))
+    return cursor.fetchone()[0]
+
+
+def set_refresh_watermark(cursor, table_name: str, watermark) -> None:
+    """Record watermark (from next_refresh_watermark) for table_name."""
+    cursor.execute("""
+        INSERT INTO refresh_state (table_name, last_refreshed_at)
+        VALUES (%s, %s)
+        ON CONFLICT (table_name)
+        DO UPDATE SET last_refreshed_at = EXCLUDED.last_refreshed_at
+    """, (table_name, watermark))
+
+
+# ========================================
+# AGGREGATE REFRESHES
+# ========================================
+
+
+def refresh_customer_summary(full_refresh: bool = False):
+    """Refresh customer summary - recalculate changed customers from base tables."""
+
+    logger.info("⏳ Refreshing customer_summary...")
+    print("⏳ Refreshing customer_summary...")
+
+    try:
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            configure_refresh_session(cursor)
+
+            watermark = None if full_refresh else get_refresh_watermark(
+                cursor, 'customer_summary')
+            next_watermark = next_refresh_watermark(cursor, 'customer_summary')
+
+            # DELETE rather than TRUNCATE/DROP: the swap commits atomically
+            # with the INSERT, so readers keep seeing the old rows meanwhile
+            if watermark is None:
+                cursor.execute("DELETE FROM customer_summary")
+                scope = ""
+            else:
+                cursor.execute("""
+                    CREATE TEMP TABLE changed_customers ON COMMIT DROP AS
+                    SELECT customer_id FROM orders
+                    WHERE created_at > %(since)s OR updated_at > %(since)s
+                    UNION
+                    SELECT customer_id FROM customers
+                    WHERE created_at > %(since)s OR updated_at > %(since)s
+                """, {'since': watermark})
+                cursor.execute("""
+                    DELETE FROM customer_summary
+                    WHERE customer_id IN (SELECT customer_id FROM changed_customers)
+                """)
+                scope = "WHERE c.customer_id IN (SELECT customer_id FROM changed_customers)"
+
+            query = f"""
+            INSERT INTO customer_summary
+            SELECT
+                c.customer_id,
+                c.first_name || ' ' || c.last_name AS customer_name,
+                c.email,
+                c.city,
+                c.state,
+                COUNT(o.order_id) AS total_orders,
+                COALESCE(SUM(o.total_amount), 0) AS total_spent,
+                COALESCE(AVG(o.total_amount), 0) AS avg_order_value,
+                MIN(o.order_date) AS first_purchase_date,
+                MAX(o.order_date) AS last_purchase_date,
+                CURRENT_DATE - MAX(o.order_date)::DATE AS days_since_last_order,
+                COUNT(DISTINCT o.product_id) AS unique_products_purchased,
+                CASE
+                    WHEN MAX(o.order_date) >= CURRENT_DATE - INTERVAL '30 days' THEN 'Active'
+                    WHEN MAX(o.order_date) >= CURRENT_DATE - INTERVAL '90 days' THEN 'At Risk'
+                    ELSE 'Churned'
+                END AS customer_status,
+                CURRENT_TIMESTAMP AS last_updated
+            FROM customers c
+            LEFT JOIN orders o ON c.customer_id = o.customer_id
+                AND o.order_status = 'Delivered'
+            {scope}
+            GROUP BY c.customer_id, c.first_name, c.last_name, c.email, c.city, c.state
+            ORDER BY total_spent DESC
+            """
+
+            cursor.execute(query)
+            count = cursor.rowcount
+
+            if watermark is not None:
+                # Recency columns depend on today's date, not on new orders,
+                # so roll them forward for the untouched rows as well
+                cursor.execute("""
+                    UPDATE customer_summary
+                    SET days_since_last_order = CURRENT_DATE - last_purchase_date::DATE,
+                        customer_status = CASE
+                            WHEN last_purchase_date >= CURRENT_DATE - INTERVAL '30 days' THEN 'Active'
+                            WHEN last_purchase_date >= CURRENT_DATE - INTERVAL '90 days' THEN 'At Risk'
+                            ELSE 'Churned'
+                        END
+                    WHERE days_since_last_order IS DISTINCT FROM
+                          CURRENT_DATE - last_purchase_date::DATE
+                """)
+
+            set_refresh_watermark(cursor, 'customer_summary', next_watermark)
+            conn.commit()
+
+            mode = "full" if watermark is None else "incremental"
+            logger.info(
+                f"✓ Refreshed customer_summary ({mode}): {count} records")
+            print(f"✓ Refreshed customer_summary ({mode}): {count} records")
+
+            cursor.close()
 
     except Exception as e:
         logger.error(f"✗ customer_summary failed: {e}")
         raise
 
 
-def refresh_product_summary():
-    """Refresh product summary - recalculate from base tables."""
+def refresh_product_summary(full_refresh: bool = False):
+    """Refresh product summary - recalculate changed products from base tables."""
 
     logger.info("⏳ Refreshing product_summary...")
     print("⏳ Refreshing product_summary...")
 
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("DELETE FROM product_summary")
-
-        query = """
-        INSERT INTO product_summary 
-        SELECT 
-            p.product_id,
-            p.product_name,
-            p.category,
-            p.brand,
-            p.price,
-            COUNT(o.order_id) AS times_sold,
-            COUNT(DISTINCT o.order_id) AS total_orders,
-            COALESCE(SUM(o.quantity), 0) AS total_units_sold,
-            COALESCE(SUM(o.total_amount), 0) AS total_revenue,
-            COUNT(DISTINCT o.customer_id) AS unique_customers,
-            ROUND(
-                ((p.price - p.cost) / NULLIF(p.price, 0)) * 100, 2
-            ) AS profit_margin_pct,
-            CURRENT_TIMESTAMP AS last_updated
-        FROM products p
-        LEFT JOIN orders o ON p.product_id = o.product_id 
-            AND o.order_status = 'Delivered'
-        GROUP BY p.product_id, p.product_name, p.category, p.brand, p.price, p.cost
-        ORDER BY total_revenue DESC
-        """
-
-        cursor.execute(query)
-        conn.commit()
-
-        count = cursor.rowcount
-        logger.info(f"✓ Refreshed product_summary: {count} records")
-        print(f"✓ Refreshed product_summary: {count} records")
-
-        cursor.close()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            configure_refresh_session(cursor)
+
+            watermark = None if full_refresh else get_refresh_watermark(
+                cursor, 'product_summary')
+            next_watermark = next_refresh_watermark(cursor, 'product_summary')
+
+            if watermark is None:
+                cursor.execute("DELETE FROM product_summary")
+                scope = ""
+            else:
+                cursor.execute("""
+                    CREATE TEMP TABLE changed_products ON COMMIT DROP AS
+                    SELECT product_id FROM orders
+                    WHERE created_at > %(since)s OR updated_at > %(since)s
+                    UNION
+                    SELECT product_id FROM products
+                    WHERE created_at > %(since)s OR updated_at > %(since)s
+                """, {'since': watermark})
+                cursor.execute("""
+                    DELETE FROM product_summary
+                    WHERE product_id IN (SELECT product_id FROM changed_products)
+                """)
+                scope = "WHERE p.product_id IN (SELECT product_id FROM changed_products)"
+
+            query = f"""
+            INSERT INTO product_summary
+            SELECT
+                p.product_id,
+                p.product_name,
+                p.category,
+                p.brand,
+                p.price,
+                COUNT(o.order_id) AS times_sold,
+                COUNT(o.order_id) AS total_orders,
+                COALESCE(SUM(o.quantity), 0) AS total_units_sold,
+                COALESCE(SUM(o.total_amount), 0) AS total_revenue,
+                COUNT(DISTINCT o.customer_id) AS unique_customers,
+                ROUND(
+                    ((p.price - p.cost) / NULLIF(p.price, 0)) * 100, 2
+                ) AS profit_margin_pct,
+                CURRENT_TIMESTAMP AS last_updated
+            FROM products p
+            LEFT JOIN orders o ON p.product_id = o.product_id
+                AND o.order_status = 'Delivered'
+            {scope}
+            GROUP BY p.product_id, p.product_name, p.category, p.brand, p.price, p.cost
+            ORDER BY total_revenue DESC
+            """
+
+            cursor.execute(query)
+            count = cursor.rowcount
+
+            set_refresh_watermark(cursor, 'product_summary', next_watermark)
+            conn.commit()
+
+            mode = "full" if watermark is None else "incremental"
+            logger.info(
+                f"✓ Refreshed product_summary ({mode}): {count} records")
+            print(f"✓ Refreshed product_summary ({mode}): {count} records")
+
+            cursor.close()
 
     except Exception as e:
         logger.error(f"✗ product_summary failed: {e}")
         raise
 
 
-def refresh_daily_sales_summary():
-    """Refresh daily sales summary - recalculate from base tables."""
+def refresh_daily_sales_summary(full_refresh: bool = False):
+    """Refresh daily sales summary - recalculate days with new orders."""
 
     logger.info("⏳ Refreshing daily_sales_summary...")
     print("⏳ Refreshing daily_sales_summary...")
 
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("DELETE FROM daily_sales_summary")
-
-        query = """
-        INSERT INTO daily_sales_summary 
-        SELECT
-            DATE(o.order_date) AS sale_date,
-            COUNT(o.order_id) AS total_orders,
-            COUNT(DISTINCT o.customer_id) AS unique_customers,
-            COALESCE(SUM(o.total_amount), 0) AS total_revenue,
-            ROUND(COALESCE(AVG(o.total_amount), 0), 2) AS avg_order_value,
-            COALESCE(SUM(o.quantity), 0) AS total_units,
-            CURRENT_TIMESTAMP AS last_updated
-        FROM orders o
-        WHERE o.order_status = 'Delivered'
-        GROUP BY DATE(o.order_date)
-        ORDER BY sale_date DESC
-        """
-
-        cursor.execute(query)
-        conn.commit()
-
-        count = cursor.rowcount
-        logger.info(f"✓ Refreshed daily_sales_summary: {count} records")
-        print(f"✓ Refreshed daily_sales_summary: {count} records")
-
-        cursor.close()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            configure_refresh_session(cursor)
+
+            watermark = None if full_refresh else get_refresh_watermark(
+                cursor, 'daily_sales_summary')
+            next_watermark = next_refresh_watermark(cursor, 'daily_sales_summary')
+
+            if watermark is None:
+                cursor.execute("DELETE FROM daily_sales_summary")
+                scope = ""
+            else:
+                cursor.execute("""
+                    CREATE TEMP TABLE changed_days ON COMMIT DROP AS
+                    SELECT DISTINCT DATE(order_date) AS sale_date
+                    FROM orders
+                    WHERE created_at > %(since)s OR updated_at > %(since)s
+                """, {'since': watermark})
+                cursor.execute("""
+                    DELETE FROM daily_sales_summary
+                    WHERE sale_date IN (SELECT sale_date FROM changed_days)
+                """)
+                scope = "AND DATE(o.order_date) IN (SELECT sale_date FROM changed_days)"
+
+            query = f"""
+            INSERT INTO daily_sales_summary
+            SELECT
+                DATE(o.order_date) AS sale_date,
+                COUNT(o.order_id) AS total_orders,
+                COUNT(DISTINCT o.customer_id) AS unique_customers,
+                COALESCE(SUM(o.total_amount), 0) AS total_revenue,
+                ROUND(COALESCE(AVG(o.total_amount), 0), 2) AS avg_order_value,
+                COALESCE(SUM(o.quantity), 0) AS total_units,
+                CURRENT_TIMESTAMP AS last_updated
+            FROM orders o
+            WHERE o.order_status = 'Delivered'
+            {scope}
+            GROUP BY DATE(o.order_date)
+            ORDER BY sale_date DESC
+            """
+
+            cursor.execute(query)
+            count = cursor.rowcount
+
+            set_refresh_watermark(cursor, 'daily_sales_summary', next_watermark)
+            conn.commit()
+
+            mode = "full" if watermark is None else "incremental"
+            logger.info(
+                f"✓ Refreshed daily_sales_summary ({mode}): {count} records")
+            print(
+                f"✓ Refreshed daily_sales_summary ({mode}): {count} records")
+
+            cursor.close()
 
     except Exception as e:
         logger.error(f"✗ daily_sales_summary failed: {e}")
         raise
 
 
-def refresh_monthly_sales_summary():
-    """Refresh monthly sales summary - recalculate from base tables."""
+def refresh_monthly_sales_summary(full_refresh: bool = False):
+    """Refresh monthly sales summary - recalculate months with new orders."""
 
     logger.info("⏳ Refreshing monthly_sales_summary...")
     print("⏳ Refreshing monthly_sales_summary...")
 
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("DELETE FROM monthly_sales_summary")
-
-        query = """
-        INSERT INTO monthly_sales_summary 
-        SELECT
-            DATE_TRUNC('month', o.order_date)::DATE AS month,
-            COUNT(o.order_id) AS total_orders,
-            COUNT(DISTINCT o.customer_id) AS unique_customers,
-            COALESCE(SUM(o.total_amount), 0) AS total_revenue,
-            ROUND(COALESCE(AVG(o.total_amount), 0), 2) AS avg_order_value,
-            COALESCE(SUM(o.quantity), 0) AS total_units,
-            LAG(SUM(o.total_amount)) OVER (
-                ORDER BY DATE_TRUNC('month', o.order_date)
-            ) AS prev_month_revenue,
-            ROUND(
-                (SUM(o.total_amount) - LAG(SUM(o.total_amount)) OVER (
-                    ORDER BY DATE_TRUNC('month', o.order_date)
-                )) / NULLIF(LAG(SUM(o.total_amount)) OVER (
-                    ORDER BY DATE_TRUNC('month', o.order_date)
-                ), 0) * 100, 2
-            ) AS mom_growth_pct,
-            CURRENT_TIMESTAMP AS last_updated
-        FROM orders o
-        WHERE o.order_status = 'Delivered'
-        GROUP BY DATE_TRUNC('month', o.order_date)
-        ORDER BY month DESC
-        """
-
-        cursor.execute(query)
-        conn.commit()
-
-        count = cursor.rowcount
-        logger.info(f"✓ Refreshed monthly_sales_summary: {count} records")
-        print(f"✓ Refreshed monthly_sales_summary: {count} records")
-
-        cursor.close()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            configure_refresh_session(cursor)
+
+            watermark = None if full_refresh else get_refresh_watermark(
+                cursor, 'monthly_sales_summary')
+            next_watermark = next_refresh_watermark(cursor, 'monthly_sales_summary')
+
+            if watermark is None:
+                cursor.execute("DELETE FROM monthly_sales_summary")
+                scope = ""
+            else:
+                cursor.execute("""
+                    CREATE TEMP TABLE changed_months ON COMMIT DROP AS
+                    SELECT DISTINCT DATE_TRUNC('month', order_date)::DATE AS month
+                    FROM orders
+                    WHERE created_at > %(since)s OR updated_at > %(since)s
+                """, {'since': watermark})
+                cursor.execute("""
+                    DELETE FROM monthly_sales_summary
+                    WHERE month IN (SELECT month FROM changed_months)
+                """)
+                scope = "AND DATE_TRUNC('month', o.order_date)::DATE IN (SELECT month FROM changed_months)"
+
+            query = f"""
+            INSERT INTO monthly_sales_summary (
+                month, total_orders, unique_customers, total_revenue,
+                avg_order_value, total_units, last_updated
+            )
+            SELECT
+                DATE_TRUNC('month', o.order_date)::DATE AS month,
+                COUNT(o.order_id) AS total_orders,
+                COUNT(DISTINCT o.customer_id) AS unique_customers,
+                COALESCE(SUM(o.total_amount), 0) AS total_revenue,
+                ROUND(COALESCE(AVG(o.total_amount), 0), 2) AS avg_order_value,
+                COALESCE(SUM(o.quantity), 0) AS total_units,
+                CURRENT_TIMESTAMP AS last_updated
+            FROM orders o
+            WHERE o.order_status = 'Delivered'
+            {scope}
+            GROUP BY DATE_TRUNC('month', o.order_date)
+            ORDER BY month DESC
+            """
+
+            cursor.execute(query)
+            count = cursor.rowcount
+
+            # Growth compares each month with the previous summary row, so
+            # it is recomputed from the (small) summary table after any change
+            cursor.execute("""
+                UPDATE monthly_sales_summary m
+                SET prev_month_revenue = g.prev_month_revenue,
+                    mom_growth_pct = ROUND(
+                        (m.total_revenue - g.prev_month_revenue)
+                        / NULLIF(g.prev_month_revenue, 0) * 100, 2
+                    )
+                FROM (
+                    SELECT month,
+                        LAG(total_revenue) OVER (ORDER BY month) AS prev_month_revenue
+                    FROM monthly_sales_summary
+                ) g
+                WHERE m.month = g.month
+            """)
+
+            set_refresh_watermark(cursor, 'monthly_sales_summary', next_watermark)
+            conn.commit()
+
+            mode = "full" if watermark is None else "incremental"
+            logger.info(
+                f"✓ Refreshed monthly_sales_summary ({mode}): {count} records")
+            print(
+                f"✓ Refreshed monthly_sales_summary ({mode}): {count} records")
+
+            cursor.close()
 
     except Exception as e:
         logger.error(f"✗ monthly_sales_summary failed: {e}")
         raise
 
 
-def main():
+def main(full_refresh: bool = Config.AGGREGATION_FULL_REFRESH):
     """Refresh all aggregation tables."""
 
     logger.info("=" * 60)
     logger.info("REFRESH AGGREGATIONS")
     logger.info(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info(f"Mode: {'FULL' if full_refresh else 'INCREMENTAL'}")
     logger.info("=" * 60)
 
     print("=" * 60)
     print("REFRESH AGGREGATIONS")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Mode: {'FULL' if full_refresh else 'INCREMENTAL'}")
     print("=" * 60)
 
     try:
-        refresh_customer_summary()
-        refresh_product_summary()
-        refresh_daily_sales_summary()
-        refresh_monthly_sales_summary()
+        ensure_refresh_state()
+
+        # The four summaries only read base tables, so each refreshes in
+        # its own transaction on its own pooled connection
+        refreshes = [
+            refresh_customer_summary,
+            refresh_product_summary,
+            refresh_daily_sales_summary,
+            refresh_monthly_sales_summary,
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(refreshes)) as executor:
+            futures = [executor.submit(refresh, full_refresh)
+                       for refresh in refreshes]
+            for future in futures:
+                future.result()
+
+        # Reclaim the rows replaced by DELETE + INSERT and refresh stats
+        vacuum_analyze('customer_summary', 'product_summary',
+                       'daily_sales_summary', 'monthly_sales_summary')
 
         logger.info("=" * 60)
         logger.info("✓ ALL AGGREGATIONS REFRESHED SUCCESSFULLY")
-        logger.info(f"Recalculated from ALL cumulative base data")
+        logger.info(f"Changes applied from cumulative base data")
         logger.info("=" * 60)
 
         print("=" * 60)
         print("✓ ALL AGGREGATIONS REFRESHED SUCCESSFULLY")
-        print(f"Recalculated from ALL cumulative base data")
+        print(f"Changes applied from cumulative base data")
         print("=" * 60)
 
     except Exception as e:
@@ -264,6 +516,9 @@ def main():
         print(f"✗ Refresh failed: {e}")
         sys.exit(1)
 
+    finally:
+        close_pool()
+
 
 if __name__ == "__main__":
     Config.create_directories()
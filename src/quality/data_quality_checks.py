@@ -15,38 +15,162 @@ Date: November 6, 2025
 """
 
 import os
+import sys
+import time
+import hashlib
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from loguru import logger
 import json
 
-# Configure logging
-logger.add("logs/data_quality_{time:YYYY-MM-DD}.log", level="INFO")
+from src.utils.config import Config
+
+# Log file sink id, set by _configure_logging() on first use
+_log_sink_id: Optional[int] = None
+
+# Checks are independent and I/O-bound, so they run concurrently - one
+# pooled connection per worker thread
+QUALITY_CHECK_WORKERS = int(os.getenv('QUALITY_CHECK_WORKERS', 4))
+
+# Reuse results across runs while the checked tables are unchanged
+# (same pg_stat_user_tables counters). Off by default: time-dependent
+# checks such as future order dates can go stale until the TTL expires.
+QUALITY_CHECK_CACHE = os.getenv('QUALITY_CHECK_CACHE', 'false').lower() == 'true'
+QUALITY_CHECK_CACHE_FILE = 'data/processed/.qc_cache.json'
+QUALITY_CHECK_CACHE_TTL_SECONDS = 24 * 60 * 60
+CHECKED_TABLES = ('customers', 'products', 'orders', 'customer_summary')
+
+# (check_name, query, column, expected, severity) - checks against the same
+# table share one query and each reads its own column from the result row
+CheckSpec = Tuple[str, str, str, Any, str]
+
+# ========================================
+# FUSED PER-TABLE QUERIES
+# ========================================
+
+# One pass over each table: every per-column check is a FILTER aggregate
+
+CUSTOMERS_CHECK_QUERY = """
+    SELECT
+        COUNT(*) FILTER (WHERE email IS NULL) AS null_email,
+        COUNT(*) FILTER (WHERE customer_id IS NULL) AS null_customer_id,
+        COUNT(*) FILTER (WHERE age < 18 OR age > 120) AS bad_age,
+        COUNT(*) FILTER (WHERE NOT email_valid) AS bad_email
+    FROM customers
+"""
+
+PRODUCTS_CHECK_QUERY = """
+    SELECT
+        COUNT(*) FILTER (WHERE product_name IS NULL) AS null_product_name,
+        COUNT(*) FILTER (WHERE price IS NULL) AS null_price,
+        COUNT(*) FILTER (WHERE price <= 0) AS bad_price
+    FROM products
+"""
+
+ORDERS_CHECK_QUERY = """
+    SELECT
+        COUNT(*) FILTER (WHERE order_id IS NULL) AS null_order_id,
+        COUNT(*) FILTER (WHERE total_amount IS NULL) AS null_total_amount,
+        COUNT(*) FILTER (WHERE total_amount <= 0) AS bad_total_amount,
+        COUNT(*) FILTER (WHERE quantity <= 0) AS bad_quantity,
+        COUNT(*) FILTER (WHERE order_date > CURRENT_TIMESTAMP) AS future_order_date
+    FROM orders
+"""
+
+# Referential and business-rule checks share one pass over orders; the
+# summary row-count delta rides along as a second CTE. Orphans use the
+# same NOT EXISTS probes as the DAGs and validate_data.py; products is
+# joined only for the price behind the amount check.
+CONSISTENCY_CHECK_QUERY = """
+    WITH order_checks AS (
+        SELECT
+            COUNT(*) FILTER (WHERE NOT EXISTS (
+                SELECT 1 FROM customers c WHERE c.customer_id = o.customer_id
+            )) AS orphan_customers,
+            COUNT(*) FILTER (WHERE NOT EXISTS (
+                SELECT 1 FROM products p WHERE p.product_id = o.product_id
+            )) AS orphan_products,
+            COUNT(*) FILTER (
+                WHERE ABS(o.total_amount - (o.quantity * op.price)) > (o.quantity * op.price * 0.01)
+            ) AS amount_mismatches
+        FROM orders o
+        LEFT JOIN products op ON op.product_id = o.product_id
+    ),
+    summary_delta AS (
+        SELECT ABS(
+            (SELECT COUNT(DISTINCT customer_id) FROM orders WHERE order_status = 'Delivered') -
+            (SELECT COUNT(*) FROM customer_summary)
+        ) AS customer_summary_delta
+    )
+    SELECT * FROM order_checks, summary_delta
+"""
+
+# Duplicate counts per key column, ignoring NULL keys: surplus rows
+# (used by the checks below) or keys that repeat (the HTML report)
+DUPLICATE_ROWS_QUERY = "SELECT COUNT({column}) - COUNT(DISTINCT {column}) FROM {table}"
+DUPLICATE_KEYS_QUERY = """SELECT COUNT(*) FROM (
+                     SELECT {column} FROM {table} WHERE {column} IS NOT NULL
+                     GROUP BY {column} HAVING COUNT(*) > 1
+                 ) dup"""
+
+
+def uniqueness_query(columns: List[Tuple[str, str]], count_query: str = DUPLICATE_ROWS_QUERY) -> str:
+    """
+    Build one statement returning a dup_<column> count per (table, column).
+
+    A single-column PRIMARY KEY or UNIQUE constraint already rules out
+    duplicates, so count_query only runs for columns without one
+    (Postgres evaluates the untaken CASE branch lazily).
+    """
+    return """
+    WITH unique_columns AS (
+        SELECT con.conrelid, att.attname
+        FROM pg_constraint con
+        JOIN pg_attribute att
+          ON att.attrelid = con.conrelid AND att.attnum = con.conkey[1]
+        WHERE con.contype IN ('p', 'u')
+          AND cardinality(con.conkey) = 1
+    )
+    SELECT
+""" + ",\n".join(f"""
+        CASE WHEN EXISTS (
+                 SELECT 1 FROM unique_columns
+                 WHERE conrelid = '{table}'::regclass AND attname = '{column}'
+             )
+             THEN 0
+             ELSE ({count_query.format(table=table, column=column)})
+        END AS dup_{column}""" for table, column in columns)
+
+
+UNIQUE_COLUMNS = [
+    ('customers', 'customer_id'),
+    ('products', 'product_id'),
+    ('orders', 'order_id'),
+    ('customers', 'email'),
+]
+
+UNIQUENESS_CHECK_QUERY = uniqueness_query(UNIQUE_COLUMNS)
 
 
 class DatabaseConnection:
-    """Manage PostgreSQL database connections with error handling."""
+    """Manage a pool of PostgreSQL connections with error handling."""
 
-    def __init__(self):
-        """Initialize database connection from environment variables."""
-        self.conn = None
+    def __init__(self, max_connections: int = QUALITY_CHECK_WORKERS):
+        """Initialize connection pool from the shared Config."""
+        self.pool: Optional[ThreadedConnectionPool] = None
+        self.max_connections = max_connections
         self._connect()
 
     def _connect(self) -> None:
-        """Create database connection with error handling."""
+        """Create connection pool with error handling."""
         try:
-            db_config = {
-                'host': os.getenv('ECOMMERCE_DB_HOST', 'localhost'),
-                'port': int(os.getenv('ECOMMERCE_DB_PORT', 5432)),
-                'database': os.getenv('ECOMMERCE_DB_NAME', 'ecommerce_db'),
-                'user': os.getenv('ECOMMERCE_DB_USER', 'dataeng'),
-                'password': os.getenv('ECOMMERCE_DB_PASSWORD', 'pipeline123'),
-                'connect_timeout': 5
-            }
-
-            self.conn = psycopg2.connect(**db_config)
-            logger.info("✓ Database connection established")
+            # Parsed once from the environment when Config is imported
+            self.pool = ThreadedConnectionPool(
+                1, self.max_connections, **Config.get_db_config())
+            logger.info("✓ Database connection pool established")
 
         except psycopg2.OperationalError as e:
             logger.error(f"✗ Database connection failed: {e}")
@@ -56,17 +180,32 @@ class DatabaseConnection:
             raise
 
     def execute_query(self, query: str) -> Any:
-        """Execute query and return result with error handling."""
-        try:
-            if not self.conn:
-                raise RuntimeError("Database connection not established")
+        """Execute query and return the first column of the first row."""
+        row, _ = self._fetchone(query)
+        return row[0]
 
-            cursor = self.conn.cursor()
-            cursor.execute(query)
-            result = cursor.fetchone()[0]
-            cursor.close()
+    def execute_row(self, query: str) -> Dict[str, Any]:
+        """Execute query and return the first row keyed by column name."""
+        row, columns = self._fetchone(query)
+        return dict(zip(columns, row))
 
-            return result
+    def _fetchone(self, query: str) -> Tuple[tuple, List[str]]:
+        """
+        Execute query on a pooled connection and return (row, column names).
+
+        Safe to call from several threads at once.
+        """
+        if not self.pool:
+            raise RuntimeError("Database connection not established")
+
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query)
+                row = cursor.fetchone()
+                columns = [desc[0] for desc in cursor.description]
+
+            return row, columns
 
         except psycopg2.ProgrammingError as e:
             logger.error(f"✗ SQL syntax error: {e}")
@@ -74,273 +213,211 @@ class DatabaseConnection:
         except Exception as e:
             logger.error(f"✗ Query execution error: {e}")
             raise
+        finally:
+            # End the read-only transaction so the next worker starts clean
+            if not conn.closed:
+                conn.rollback()
+            self.pool.putconn(conn)
 
     def close(self) -> None:
-        """Close database connection safely."""
-        if self.conn:
-            self.conn.close()
-            logger.info("✓ Database connection closed")
+        """Close all pooled connections safely."""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+            logger.info("✓ Database connection pool closed")
 
 
 class DataQualityChecker:
     """Main class for running data quality checks."""
 
-    def __init__(self):
-        """Initialize quality checker with database connection."""
-        self.db = DatabaseConnection()
+    def __init__(
+        self,
+        max_workers: int = QUALITY_CHECK_WORKERS,
+        use_cache: bool = QUALITY_CHECK_CACHE
+    ):
+        """Initialize quality checker with a database connection pool."""
+        self.max_workers = max_workers
+        self.use_cache = use_cache
+        self.db = DatabaseConnection(max_connections=max_workers)
         self.results: List[Dict[str, Any]] = []
         self.passed: int = 0
         self.failed: int = 0
         self.timestamp = datetime.now()
-
-    def run_check(
+        self._run_iso = self.timestamp.isoformat()
+        self._t0 = time.perf_counter()
+        # Console report lines, written in one go by _flush_console()
+        self._console_lines: List[str] = []
+
+    def _flush_console(self) -> None:
+        """Write buffered report lines to stdout with a single write."""
+        if self._console_lines:
+            sys.stdout.write("\n".join(self._console_lines) + "\n")
+            sys.stdout.flush()
+            self._console_lines.clear()
+
+    def _record_result(
         self,
         check_name: str,
-        query: str,
         expected: Any,
-        severity: str = "ERROR"
+        severity: str,
+        result: Any
     ) -> bool:
-        """
-        Run a single quality check.
-
-        Args:
-            check_name: Name of the check
-            query: SQL query to execute
-            expected: Expected value for the check to pass
-            severity: ERROR or WARNING
+        """Record and report the outcome of a completed check."""
+        passed = (result == expected)
+
+        self.results.append({
+            'check_name': check_name,
+            'severity': severity,
+            'status': 'PASS' if passed else 'FAIL',
+            'expected': expected,
+            'actual': result,
+            'run_ts': self._run_iso,
+            'elapsed_s': round(time.perf_counter() - self._t0, 6)
+        })
+
+        if passed:
+            self.passed += 1
+            logger.info(f"✓ {check_name}: PASS")
+            self._console_lines.append(f" ✓ {check_name}: PASS")
+        else:
+            self.failed += 1
+            logger.warning(
+                f"✗ {check_name}: FAIL (Expected: {expected}, Got: {result})")
+            self._console_lines.append(
+                f" ✗ {check_name}: FAIL (Expected: {expected}, Got: {result})")
 
-        Returns:
-            bool: True if check passed
-        """
-        try:
-            result = self.db.execute_query(query)
-            passed = (result == expected)
-
-            self.results.append({
-                'check_name': check_name,
-                'severity': severity,
-                'status': 'PASS' if passed else 'FAIL',
-                'expected': expected,
-                'actual': result,
-                'timestamp': datetime.now().isoformat()
-            })
-
-            if passed:
-                self.passed += 1
-                logger.info(f"✓ {check_name}: PASS")
-                print(f" ✓ {check_name}: PASS")
-            else:
-                self.failed += 1
-                logger.warning(
-                    f"✗ {check_name}: FAIL (Expected: {expected}, Got: {result})")
-                print(
-                    f" ✗ {check_name}: FAIL (Expected: {expected}, Got: {result})")
-
-            return passed
+        return passed
 
-        except Exception as e:
-            self.failed += 1
-            self.results.append({
-                'check_name': check_name,
-                'severity': severity,
-                'status': 'ERROR',
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            })
-            logger.error(f"✗ {check_name}: ERROR - {e}")
-            print(f" ✗ {check_name}: ERROR - {e}")
-            return False
+    def _record_error(
+        self,
+        check_name: str,
+        severity: str,
+        error: Exception
+    ) -> bool:
+        """Record and report a check whose query raised."""
+        self.failed += 1
+        self.results.append({
+            'check_name': check_name,
+            'severity': severity,
+            'status': 'ERROR',
+            'error': str(error),
+            'run_ts': self._run_iso,
+            'elapsed_s': round(time.perf_counter() - self._t0, 6)
+        })
+        logger.error(f"✗ {check_name}: ERROR - {error}")
+        self._console_lines.append(f" ✗ {check_name}: ERROR - {error}")
+        return False
 
     # ========================================
     # COMPLETENESS CHECKS
     # ========================================
 
-    def check_completeness(self) -> None:
+    def check_completeness(self) -> List[CheckSpec]:
         """Check for null values in critical columns."""
-        logger.info("Starting COMPLETENESS checks")
-        print("\n📋 COMPLETENESS CHECKS")
-        print("-" * 60)
-
-        # Customer table
-        self.run_check(
-            "Customers: No NULL emails",
-            "SELECT COUNT(*) FROM customers WHERE email IS NULL",
-            0
-        )
-
-        self.run_check(
-            "Customers: No NULL customer_ids",
-            "SELECT COUNT(*) FROM customers WHERE customer_id IS NULL",
-            0
-        )
-
-        # Products table
-        self.run_check(
-            "Products: No NULL product names",
-            "SELECT COUNT(*) FROM products WHERE product_name IS NULL",
-            0
-        )
-
-        self.run_check(
-            "Products: No NULL prices",
-            "SELECT COUNT(*) FROM products WHERE price IS NULL",
-            0
-        )
-
-        # Orders table
-        self.run_check(
-            "Orders: No NULL order_ids",
-            "SELECT COUNT(*) FROM orders WHERE order_id IS NULL",
-            0
-        )
-
-        self.run_check(
-            "Orders: No NULL total_amounts",
-            "SELECT COUNT(*) FROM orders WHERE total_amount IS NULL",
-            0
-        )
+        return [
+            # Customer table
+            ("Customers: No NULL emails",
+             CUSTOMERS_CHECK_QUERY, "null_email", 0, "ERROR"),
+            ("Customers: No NULL customer_ids",
+             CUSTOMERS_CHECK_QUERY, "null_customer_id", 0, "ERROR"),
+
+            # Products table
+            ("Products: No NULL product names",
+             PRODUCTS_CHECK_QUERY, "null_product_name", 0, "ERROR"),
+            ("Products: No NULL prices",
+             PRODUCTS_CHECK_QUERY, "null_price", 0, "ERROR"),
+
+            # Orders table
+            ("Orders: No NULL order_ids",
+             ORDERS_CHECK_QUERY, "null_order_id", 0, "ERROR"),
+            ("Orders: No NULL total_amounts",
+             ORDERS_CHECK_QUERY, "null_total_amount", 0, "ERROR"),
+        ]
 
     # ========================================
     # VALIDITY CHECKS
     # ========================================
 
-    def check_validity(self) -> None:
+    def check_validity(self) -> List[CheckSpec]:
         """Check data ranges and formats."""
-        logger.info("Starting VALIDITY checks")
-        print("\n✅ VALIDITY CHECKS")
-        print("-" * 60)
-
-        # Age ranges
-        self.run_check(
-            "Customers: Age between 18-120",
-            "SELECT COUNT(*) FROM customers WHERE age < 18 OR age > 120",
-            0
-        )
-
-        # Price ranges
-        self.run_check(
-            "Products: Price > 0",
-            "SELECT COUNT(*) FROM products WHERE price <= 0",
-            0
-        )
-
-        self.run_check(
-            "Orders: Total amount > 0",
-            "SELECT COUNT(*) FROM orders WHERE total_amount <= 0",
-            0
-        )
-
-        # Quantity ranges
-        self.run_check(
-            "Orders: Quantity > 0",
-            "SELECT COUNT(*) FROM orders WHERE quantity <= 0",
-            0
-        )
-
-        # Email format (basic check)
-        self.run_check(
-            "Customers: Valid email format",
-            "SELECT COUNT(*) FROM customers WHERE email NOT LIKE '%@%.%'",
-            0
-        )
-
-        # Date ranges
-        self.run_check(
-            "Orders: No future order dates",
-            "SELECT COUNT(*) FROM orders WHERE order_date > CURRENT_TIMESTAMP",
-            0
-        )
+        return [
+            # Age ranges
+            ("Customers: Age between 18-120",
+             CUSTOMERS_CHECK_QUERY, "bad_age", 0, "ERROR"),
+
+            # Price ranges
+            ("Products: Price > 0",
+             PRODUCTS_CHECK_QUERY, "bad_price", 0, "ERROR"),
+            ("Orders: Total amount > 0",
+             ORDERS_CHECK_QUERY, "bad_total_amount", 0, "ERROR"),
+
+            # Quantity ranges
+            ("Orders: Quantity > 0",
+             ORDERS_CHECK_QUERY, "bad_quantity", 0, "ERROR"),
+
+            # Email format (basic check)
+            ("Customers: Valid email format",
+             CUSTOMERS_CHECK_QUERY, "bad_email", 0, "ERROR"),
+
+            # Date ranges
+            ("Orders: No future order dates",
+             ORDERS_CHECK_QUERY, "future_order_date", 0, "ERROR"),
+        ]
 
     # ========================================
     # CONSISTENCY CHECKS
     # ========================================
 
-    def check_consistency(self) -> None:
+    def check_consistency(self) -> List[CheckSpec]:
         """Check referential integrity."""
-        logger.info("Starting CONSISTENCY checks")
-        print("\n🔗 CONSISTENCY CHECKS")
-        print("-" * 60)
-
-        # Foreign key integrity
-        self.run_check(
-            "Orders: All customer_ids exist in customers",
-            """SELECT COUNT(*) FROM orders o
-               LEFT JOIN customers c ON o.customer_id = c.customer_id
-               WHERE c.customer_id IS NULL""",
-            0
-        )
-
-        self.run_check(
-            "Orders: All product_ids exist in products",
-            """SELECT COUNT(*) FROM orders o
-               LEFT JOIN products p ON o.product_id = p.product_id
-               WHERE p.product_id IS NULL""",
-            0
-        )
-
-        # Business logic consistency
-        self.run_check(
-            "Orders: Quantity * Price = Total (within 1%)",
-            """SELECT COUNT(*) FROM orders o
-               JOIN products p ON o.product_id = p.product_id
-               WHERE ABS(o.total_amount - (o.quantity * p.price)) > (o.quantity * p.price * 0.01)""",
-            0,
-            severity="WARNING"
-        )
-
-        # Aggregate table consistency
-        self.run_check(
-            "Customer Summary: Row count matches active customers",
-            """SELECT ABS(
-                   (SELECT COUNT(DISTINCT customer_id) FROM orders WHERE order_status = 'Delivered') -
-                   (SELECT COUNT(*) FROM customer_summary)
-               )""",
-            0,
-            severity="WARNING"
-        )
+        return [
+            # Foreign key integrity
+            ("Orders: All customer_ids exist in customers",
+             CONSISTENCY_CHECK_QUERY, "orphan_customers", 0, "ERROR"),
+            ("Orders: All product_ids exist in products",
+             CONSISTENCY_CHECK_QUERY, "orphan_products", 0, "ERROR"),
+
+            # Business logic consistency
+            ("Orders: Quantity * Price = Total (within 1%)",
+             CONSISTENCY_CHECK_QUERY, "amount_mismatches", 0, "WARNING"),
+
+            # Aggregate table consistency
+            ("Customer Summary: Row count matches active customers",
+             CONSISTENCY_CHECK_QUERY, "customer_summary_delta", 0, "WARNING"),
+        ]
 
     # ========================================
     # UNIQUENESS CHECKS
     # ========================================
 
-    def check_uniqueness(self) -> None:
-        """Check for duplicate records."""
-        logger.info("Starting UNIQUENESS checks")
-        print("\n🔑 UNIQUENESS CHECKS")
-        print("-" * 60)
-
-        # Primary key uniqueness
-        self.run_check(
-            "Customers: No duplicate customer_ids",
-            "SELECT COUNT(*) - COUNT(DISTINCT customer_id) FROM customers",
-            0
-        )
-
-        self.run_check(
-            "Products: No duplicate product_ids",
-            "SELECT COUNT(*) - COUNT(DISTINCT product_id) FROM products",
-            0
-        )
-
-        self.run_check(
-            "Orders: No duplicate order_ids",
-            "SELECT COUNT(*) - COUNT(DISTINCT order_id) FROM orders",
-            0
-        )
-
-        # Business uniqueness
-        self.run_check(
-            "Customers: No duplicate emails",
-            "SELECT COUNT(*) - COUNT(DISTINCT email) FROM customers",
-            0
-        )
+    def check_uniqueness(self) -> List[CheckSpec]:
+        """Check for duplicate records (catalog lookup where constrained)."""
+        return [
+            # Primary key uniqueness
+            ("Customers: No duplicate customer_ids",
+             UNIQUENESS_CHECK_QUERY, "dup_customer_id", 0, "ERROR"),
+            ("Products: No duplicate product_ids",
+             UNIQUENESS_CHECK_QUERY, "dup_product_id", 0, "ERROR"),
+            ("Orders: No duplicate order_ids",
+             UNIQUENESS_CHECK_QUERY, "dup_order_id", 0, "ERROR"),
+
+            # Business uniqueness
+            ("Customers: No duplicate emails",
+             UNIQUENESS_CHECK_QUERY, "dup_email", 0, "ERROR"),
+        ]
 
     # ========================================
     # RUN ALL CHECKS & GENERATE REPORT
     # ========================================
 
     def run_all_checks(self) -> List[Dict[str, Any]]:
-        """Execute all quality checks."""
+        """
+        Execute all quality checks.
+
+        Each distinct query is submitted once to a thread pool up front
+        (checks on the same table share a fused query); results are then
+        reported category by category in definition order.
+        """
         logger.info("=" * 60)
         logger.info("DATA QUALITY VALIDATION STARTED")
         logger.info(
@@ -351,21 +428,125 @@ class DataQualityChecker:
         print(f"Started: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
 
-        try:
-            self.check_completeness()
-            self.check_validity()
-            self.check_consistency()
-            self.check_uniqueness()
+        categories = [
+            ("COMPLETENESS", "📋", self.check_completeness()),
+            ("VALIDITY", "✅", self.check_validity()),
+            ("CONSISTENCY", "🔗", self.check_consistency()),
+            ("UNIQUENESS", "🔑", self.check_uniqueness()),
+        ]
 
+        try:
+            queries = list(dict.fromkeys(
+                spec[1] for _, _, specs in categories for spec in specs))
+            cache, signature = self._load_result_cache()
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                rows: Dict[str, Future] = {}
+                for query in queries:
+                    entry = cache.get(self._cache_key(query, signature))
+                    if entry is not None:
+                        rows[query] = Future()
+                        rows[query].set_result(entry['row'])
+                    else:
+                        rows[query] = executor.submit(
+                            self.db.execute_row, query)
+
+                for category, icon, specs in categories:
+                    logger.info(f"Starting {category} checks")
+                    self._console_lines.append(f"\n{icon} {category} CHECKS")
+                    self._console_lines.append("-" * 60)
+
+                    for check_name, query, column, expected, severity in specs:
+                        try:
+                            result = rows[query].result()[column]
+                        except Exception as e:
+                            self._record_error(check_name, severity, e)
+                            continue
+                        self._record_result(
+                            check_name, expected, severity, result)
+
+            self._flush_console()
+            self._save_result_cache(cache, signature, rows)
             self._print_summary()
             self._save_results()
 
             return self.results
 
         except Exception as e:
+            self._flush_console()
             logger.error(f"✗ Quality check failed: {e}")
             raise
 
+    # ========================================
+    # PERSISTENT RESULT CACHE
+    # ========================================
+
+    def _table_signature(self) -> str:
+        """Fingerprint the checked tables from their write counters."""
+        tables = ", ".join(f"'{t}'" for t in CHECKED_TABLES)
+        return self.db.execute_query(f"""
+            SELECT string_agg(
+                format('%s:%s:%s:%s:%s', relname, n_live_tup,
+                       n_tup_ins, n_tup_upd, n_tup_del),
+                ',' ORDER BY relname)
+            FROM pg_stat_user_tables
+            WHERE relname IN ({tables})
+        """)
+
+    @staticmethod
+    def _cache_key(query: str, signature: Optional[str]) -> str:
+        """Hash a query together with the table signature it ran against."""
+        text = " ".join(query.split()) + "|" + str(signature)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _load_result_cache(self) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Load unexpired cached rows and the current table signature."""
+        if not self.use_cache:
+            return {}, None
+
+        try:
+            signature = self._table_signature()
+        except Exception as e:
+            logger.warning(f"⚠️ Result cache disabled for this run: {e}")
+            self.use_cache = False
+            return {}, None
+
+        cache: Dict[str, Any] = {}
+        if os.path.exists(QUALITY_CHECK_CACHE_FILE):
+            try:
+                with open(QUALITY_CHECK_CACHE_FILE) as f:
+                    cache = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable result cache: {e}")
+
+        cutoff = time.time() - QUALITY_CHECK_CACHE_TTL_SECONDS
+        cache = {k: v for k, v in cache.items() if v['cached_at'] >= cutoff}
+        return cache, signature
+
+    def _save_result_cache(
+        self,
+        cache: Dict[str, Any],
+        signature: Optional[str],
+        rows: Dict[str, Future]
+    ) -> None:
+        """Store freshly computed rows for the next run."""
+        if not self.use_cache:
+            return
+
+        now = time.time()
+        for query, future in rows.items():
+            key = self._cache_key(query, signature)
+            if key in cache or future.exception() is not None:
+                continue
+            cache[key] = {'row': future.result(), 'cached_at': now}
+
+        try:
+            os.makedirs(os.path.dirname(QUALITY_CHECK_CACHE_FILE), exist_ok=True)
+            with open(QUALITY_CHECK_CACHE_FILE, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to save result cache: {e}")
+
     def _print_summary(self) -> None:
         """Print quality summary report."""
         total = self.passed + self.failed
@@ -397,14 +578,20 @@ class DataQualityChecker:
             f"Quality Summary - Passed: {self.passed}, Failed: {self.failed}, Grade: {grade}")
 
     def _save_results(self) -> None:
-        """Save quality check results to JSON file."""
+        """
+        Save quality check results to JSON file.
+
+        Each record carries the run start time ('run_ts') and seconds since
+        the checker was created ('elapsed_s') instead of its own timestamp.
+        """
         try:
             os.makedirs('data/processed', exist_ok=True)
 
             results_file = f"data/processed/quality_check_{self.timestamp.strftime('%Y%m%d_%H%M%S')}.json"
 
+            # One json.dumps call without indent goes through the C encoder
             with open(results_file, 'w') as f:
-                json.dump(self.results, f, indent=2)
+                f.write(json.dumps(self.results))
 
             logger.info(f"✓ Results saved to {results_file}")
             print(f"\n✓ Results saved to {results_file}")
@@ -417,8 +604,21 @@ class DataQualityChecker:
         self.db.close()
 
 
+def _configure_logging() -> None:
+    """Attach the data quality log file sink once per process."""
+    global _log_sink_id
+
+    if _log_sink_id is None:
+        _log_sink_id = logger.add(
+            "logs/data_quality_{time:YYYY-MM-DD}.log",
+            level="INFO",
+            enqueue=True
+        )
+
+
 def main():
     """Main entry point for data quality checks."""
+    _configure_logging()
     checker = None
 
     try:
@@ -15,21 +15,16 @@ Author: Abhiiram
 Date: November 6, 2025
 """
 
-from src.utils.db_connector import get_connection
+from src.utils.db_connector import db_cursor, close_pool
 from src.utils.config import Config
 import psycopg2
-import pandas as pd
-import numpy as np
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
 import sys
-import os
 from loguru import logger
 
-# Add parent directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
-
-
 # Configure logging
 logger.add(
     f"{Config.LOGS_DIR}/anomalies_{{time:YYYY-MM-DD}}.log",
@@ -45,85 +40,212 @@ class AnomalyDetector:
     """Detect anomalies in e-commerce data."""
 
     def __init__(self):
-        """Initialize detector with database connection."""
-        self.conn = None
+        """Initialize detector (connections come from the shared pool)."""
         self.anomalies: List[Dict] = []
+        # Per-thread console/anomaly buffers while detectors run concurrently
+        self._local = threading.local()
         logger.info("✓ Anomaly detector initialized")
 
-    def z_score_outliers(self, df: pd.DataFrame, column: str, threshold: float = 3.0) -> pd.DataFrame:
+    def fetch_rows(self, query: str, params: tuple = None) -> List[tuple]:
+        """Run query on a pooled connection and return all rows."""
+        with db_cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def _print(self, line: str = "") -> None:
+        """Print, or buffer the line when running on a detector thread."""
+        lines = getattr(self._local, 'lines', None)
+        if lines is None:
+            print(line)
+        else:
+            lines.append(line)
+
+    def _record_anomaly(self, anomaly: Dict) -> None:
+        """Record an anomaly, buffered per thread when running concurrently."""
+        pending = getattr(self._local, 'anomalies', None)
+        if pending is None:
+            self.anomalies.append(anomaly)
+        else:
+            pending.append(anomaly)
+
+    def _run_detector(self, detector: Callable[[], None]) -> Tuple[List[str], List[Dict], Optional[Exception]]:
+        """Run one detector on a worker thread, buffering what it reports."""
+        self._local.lines = []
+        self._local.anomalies = []
+        error = None
+
+        try:
+            detector()
+        except Exception as e:
+            error = e
+
+        lines, anomalies = self._local.lines, self._local.anomalies
+        self._local.lines = self._local.anomalies = None
+        return lines, anomalies, error
+
+    def sql_z_score_outliers(self, query: str, column: str, threshold: float, limit: int = 5) -> Tuple[int, List[tuple]]:
         """
-        Detect outliers using Z-score method.
+        Detect outliers using Z-score method, computed inside Postgres.
+
+        Only the outlier count and the top `limit` rows come back over the
+        wire. The range predicate (rather than ABS(z) > threshold) lets an
+        index on `column` serve it.
 
         Args:
-            df: DataFrame to analyze
-            column: Column name to check
-            threshold: Z-score threshold (default: 3.0)
+            query: SELECT producing the rows to analyze (must include column)
+            column: Numeric column to score
+            threshold: Z-score threshold
+            limit: Number of top outlier rows to return
 
         Returns:
-            DataFrame with outliers
+            Tuple of (outlier count, top rows - query columns plus a trailing
+            absolute z_score - highest `column` value first)
         """
         try:
-            mean = df[column].mean()
-            std = df[column].std()
+            rows = self.fetch_rows(f"""
+                WITH stats AS (
+                    SELECT AVG({column}) AS mean, STDDEV_SAMP({column}) AS std
+                    FROM ({query}) source
+                )
+                SELECT source.*,
+                       (ABS(source.{column} - stats.mean) / stats.std)::float8 AS z_score,
+                       COUNT(*) OVER () AS outlier_count
+                FROM ({query}) source, stats
+                WHERE stats.std > 0
+                  AND source.{column} NOT BETWEEN stats.mean - %s * stats.std
+                                              AND stats.mean + %s * stats.std
+                ORDER BY source.{column} DESC
+                LIMIT %s
+            """, (threshold, threshold, limit))
+            count, top = self._split_outlier_count(rows)
 
-            if std == 0:
-                return pd.DataFrame()
+            logger.info(
+                f"✓ Z-score analysis: {count} outliers found (threshold={threshold})")
+            return count, top
 
-            df['z_score'] = np.abs((df[column] - mean) / std)
-            outliers = df[df['z_score'] > threshold].copy()
+        except Exception as e:
+            logger.error(f"✗ Z-score calculation failed: {e}")
+            raise
+
+    def sql_iqr_outliers(self, query: str, column: str, multiplier: float, limit: int = 5) -> Tuple[int, List[tuple]]:
+        """
+        Detect outliers outside Q1/Q3 -/+ multiplier * IQR, inside Postgres.
+
+        Quartiles are not pulled around by the outliers themselves the
+        way mean and std are, which suits heavy-tailed money columns.
+
+        Args:
+            query: SELECT producing the rows to analyze (must include column)
+            column: Numeric column to score
+            multiplier: IQR multiplier for the fences
+            limit: Number of top outlier rows to return
+
+        Returns:
+            Tuple of (outlier count, top rows - query columns plus a trailing
+            IQR score, the distance past the nearer quartile in IQRs -
+            highest `column` value first)
+        """
+        try:
+            rows = self.fetch_rows(f"""
+                WITH quartiles AS (
+                    SELECT
+                        percentile_cont(0.25) WITHIN GROUP (ORDER BY {column}) AS q1,
+                        percentile_cont(0.75) WITHIN GROUP (ORDER BY {column}) AS q3
+                    FROM ({query}) source
+                )
+                SELECT source.*,
+                       GREATEST(source.{column} - q3, q1 - source.{column}) / (q3 - q1) AS iqr_score,
+                       COUNT(*) OVER () AS outlier_count
+                FROM ({query}) source, quartiles
+                WHERE q3 > q1
+                  AND source.{column} NOT BETWEEN q1 - %s * (q3 - q1)
+                                              AND q3 + %s * (q3 - q1)
+                ORDER BY source.{column} DESC
+                LIMIT %s
+            """, (multiplier, multiplier, limit))
+            count, top = self._split_outlier_count(rows)
 
             logger.info(
-                f"✓ Z-score analysis: {len(outliers)} outliers found (threshold={threshold})")
-            return outliers
+                f"✓ IQR analysis: {count} outliers found (multiplier={multiplier})")
+            return count, top
 
         except Exception as e:
-            logger.error(f"✗ Z-score calculation failed: {e}")
+            logger.error(f"✗ IQR calculation failed: {e}")
             raise
 
+    def product_names(self, product_ids: List[int]) -> Dict[int, str]:
+        """Map product IDs to names (one lookup for a handful of rows)."""
+        return dict(self.fetch_rows("""
+            SELECT product_id, product_name
+            FROM products
+            WHERE product_id = ANY(%s)
+        """, (list(product_ids),)))
+
+    @staticmethod
+    def _split_outlier_count(rows: List[tuple]) -> Tuple[int, List[tuple]]:
+        """Strip the trailing COUNT(*) OVER () column from outlier rows."""
+        count = rows[0][-1] if rows else 0
+        return count, [row[:-1] for row in rows]
+
+    def monetary_outliers(self, query: str, column: str, z_threshold: float) -> Tuple[int, List[tuple], str, str]:
+        """
+        Find outliers in a money column with Config.ANOMALY_MONETARY_METHOD.
+
+        Returns:
+            Tuple of (outlier count, top 5 rows with a trailing score, rule
+            description, score label)
+        """
+        if Config.ANOMALY_MONETARY_METHOD == 'iqr':
+            multiplier = Config.ANOMALY_IQR_MULTIPLIER
+            count, top = self.sql_iqr_outliers(query, column, multiplier)
+            return count, top, f"beyond {multiplier}×IQR from quartiles", "IQR score"
+
+        count, top = self.sql_z_score_outliers(query, column, threshold=z_threshold)
+        return count, top, f"Z-score > {z_threshold}", "Z-score"
+
     def detect_order_amount_anomalies(self) -> None:
         """Detect unusually high or low order amounts."""
 
         logger.info("💰 ORDER AMOUNT ANOMALIES")
-        print("\n💰 ORDER AMOUNT ANOMALIES")
-        print("-" * 60)
+        self._print("\n💰 ORDER AMOUNT ANOMALIES")
+        self._print("-" * 60)
 
         try:
             query = """
-            SELECT order_id, customer_id, product_id,
-            quantity, total_amount, order_date
+            SELECT order_id, total_amount
             FROM orders
             WHERE order_status = 'Delivered'
             """
 
-            conn = get_connection()
-            df = pd.read_sql(query, conn)
-            conn.close()
-
             # Detect outliers
-            outliers = self.z_score_outliers(
-                df, 'total_amount', threshold=Config.ANOMALY_ZSCORE_THRESHOLD)
+            count, top, rule, score_label = self.monetary_outliers(
+                query, 'total_amount', z_threshold=Config.ANOMALY_ZSCORE_THRESHOLD)
 
-            if len(outliers) > 0:
-                msg = f"Found {len(outliers)} unusual order amounts (Z-score > {Config.ANOMALY_ZSCORE_THRESHOLD})"
+            if count > 0:
+                msg = f"Found {count} unusual order amounts ({rule})"
                 logger.info(f" {msg}")
-                print(f" Found {len(outliers)} unusual order amounts")
-                print(f" Top 5 highest amounts:")
+                self._print(f" Found {count} unusual order amounts")
+                self._print(f" Top 5 highest amounts:")
 
-                top_5 = outliers.nlargest(5, 'total_amount')
-                for idx, row in top_5.iterrows():
-                    log_msg = f"  Order {row['order_id']}: ₹{row['total_amount']:,.2f} (Z-score: {row['z_score']:.2f})"
+                for order_id, total_amount, score in top:
+                    log_msg = f"  Order {order_id}: ₹{total_amount:,.2f} ({score_label}: {score:.2f})"
                     logger.info(log_msg)
-                    print(log_msg)
+                    self._print(log_msg)
 
-                self.anomalies.append({
+                if Config.ANOMALY_MONETARY_METHOD == 'iqr':
+                    details = f"Orders with amounts {rule}"
+                else:
+                    details = f"Orders with amounts >{Config.ANOMALY_ZSCORE_THRESHOLD} std deviations from mean"
+
+                self._record_anomaly({
                     'type': 'Order Amount Outliers',
-                    'count': len(outliers),
+                    'count': count,
                     'severity': 'INFO',
-                    'details': f"Orders with amounts >{Config.ANOMALY_ZSCORE_THRESHOLD} std deviations from mean"
+                    'details': details
                 })
             else:
                 logger.info(" ✓ No significant outliers detected")
-                print(" ✓ No significant outliers detected")
+                self._print(" ✓ No significant outliers detected")
 
         except Exception as e:
             logger.error(f"✗ Order amount detection failed: {e}")
@@ -133,45 +255,46 @@ class AnomalyDetector:
         """Detect unusual order quantities."""
 
         logger.info("📦 ORDER QUANTITY ANOMALIES")
-        print("\n📦 ORDER QUANTITY ANOMALIES")
-        print("-" * 60)
+        self._print("\n📦 ORDER QUANTITY ANOMALIES")
+        self._print("-" * 60)
 
         try:
-            query = """
-            SELECT o.order_id, o.customer_id, o.product_id,
-            p.product_name, o.quantity
-            FROM orders o
-            JOIN products p ON o.product_id = p.product_id
-            WHERE o.order_status = 'Delivered'
-            """
-
-            conn = get_connection()
-            df = pd.read_sql(query, conn)
-            conn.close()
+            # Count and top 5 in one round trip; only five rows come back.
+            # No products join here so the scan stays index-only - names
+            # are looked up for the top rows afterwards.
+            rows = self.fetch_rows("""
+                SELECT order_id, product_id, quantity,
+                       COUNT(*) OVER () AS high_qty_count
+                FROM orders
+                WHERE order_status = 'Delivered'
+                  AND quantity > 5
+                ORDER BY quantity DESC, order_id
+                LIMIT 5
+            """)
+            count, top = self._split_outlier_count(rows)
 
-            # High quantities
-            high_qty = df[df['quantity'] > 5]
+            if count > 0:
+                logger.info(f" Found {count} orders with quantity > 5")
+                self._print(f" Found {count} orders with quantity > 5")
+                self._print(f" Top 5 highest quantities:")
 
-            if len(high_qty) > 0:
-                logger.info(f" Found {len(high_qty)} orders with quantity > 5")
-                print(f" Found {len(high_qty)} orders with quantity > 5")
-                print(f" Top 5 highest quantities:")
+                product_names = self.product_names(
+                    [product_id for _, product_id, _ in top])
 
-                top_5 = high_qty.nlargest(5, 'quantity')
-                for idx, row in top_5.iterrows():
-                    log_msg = f"  Order {row['order_id']}: {row['quantity']} × {row['product_name']}"
+                for order_id, product_id, quantity in top:
+                    log_msg = f"  Order {order_id}: {quantity} × {product_names.get(product_id)}"
                     logger.info(log_msg)
-                    print(log_msg)
+                    self._print(log_msg)
 
-                self.anomalies.append({
+                self._record_anomaly({
                     'type': 'High Quantity Orders',
-                    'count': len(high_qty),
+                    'count': count,
                     'severity': 'INFO',
                     'details': 'Orders with quantities > 5 (potential bulk purchases)'
                 })
             else:
                 logger.info(" ✓ No unusual quantities detected")
-                print(" ✓ No unusual quantities detected")
+                self._print(" ✓ No unusual quantities detected")
 
         except Exception as e:
             logger.error(f"✗ Quantity detection failed: {e}")
@@ -181,41 +304,40 @@ class AnomalyDetector:
         """Detect customers with unusual spending patterns."""
 
         logger.info("👤 CUSTOMER SPENDING ANOMALIES")
-        print("\n👤 CUSTOMER SPENDING ANOMALIES")
-        print("-" * 60)
+        self._print("\n👤 CUSTOMER SPENDING ANOMALIES")
+        self._print("-" * 60)
 
         try:
-            query = "SELECT * FROM customer_summary"
-
-            conn = get_connection()
-            df = pd.read_sql(query, conn)
-            conn.close()
+            query = """
+            SELECT customer_name, total_orders, total_spent
+            FROM customer_summary
+            """
 
             # High spenders
-            outliers = self.z_score_outliers(df, 'total_spent', threshold=2.5)
+            count, top, rule, score_label = self.monetary_outliers(
+                query, 'total_spent', z_threshold=2.5)
 
-            if len(outliers) > 0:
+            if count > 0:
                 logger.info(
-                    f" Found {len(outliers)} customers with unusual spending (Z-score > 2.5)")
-                print(
-                    f" Found {len(outliers)} customers with unusual spending")
-                print(f" Top 5 spenders:")
-
-                top_5 = outliers.nlargest(5, 'total_spent')
-                for idx, row in top_5.iterrows():
-                    log_msg = f"  {row['customer_name']}: ₹{row['total_spent']:,.2f} ({row['total_orders']} orders, Z-score: {row['z_score']:.2f})"
+                    f" Found {count} customers with unusual spending ({rule})")
+                self._print(
+                    f" Found {count} customers with unusual spending")
+                self._print(f" Top 5 spenders:")
+
+                for customer_name, total_orders, total_spent, score in top:
+                    log_msg = f"  {customer_name}: ₹{total_spent:,.2f} ({total_orders} orders, {score_label}: {score:.2f})"
                     logger.info(log_msg)
-                    print(log_msg)
+                    self._print(log_msg)
 
-                self.anomalies.append({
+                self._record_anomaly({
                     'type': 'High-Value Customers',
-                    'count': len(outliers),
+                    'count': count,
                     'severity': 'INFO',
                     'details': 'VIP customers with exceptional spending patterns'
                 })
             else:
                 logger.info(" ✓ No unusual spending patterns detected")
-                print(" ✓ No unusual spending patterns detected")
+                self._print(" ✓ No unusual spending patterns detected")
 
         except Exception as e:
             logger.error(f"✗ Customer spending detection failed: {e}")
@@ -225,45 +347,39 @@ class AnomalyDetector:
         """Detect unusual daily sales patterns."""
 
         logger.info("📊 DAILY SALES ANOMALIES")
-        print("\n📊 DAILY SALES ANOMALIES")
-        print("-" * 60)
+        self._print("\n📊 DAILY SALES ANOMALIES")
+        self._print("-" * 60)
 
         try:
             query = """
             SELECT sale_date, total_orders, total_revenue
             FROM daily_sales_summary
-            ORDER BY sale_date DESC
             """
 
-            conn = get_connection()
-            df = pd.read_sql(query, conn)
-            conn.close()
-
             # Revenue outliers
-            outliers = self.z_score_outliers(
-                df, 'total_revenue', threshold=2.0)
+            count, top = self.sql_z_score_outliers(
+                query, 'total_revenue', threshold=2.0)
 
-            if len(outliers) > 0:
+            if count > 0:
                 logger.info(
-                    f" Found {len(outliers)} days with unusual sales (Z-score > 2.0)")
-                print(f" Found {len(outliers)} days with unusual sales")
-                print(f" Top 5 unusual days:")
+                    f" Found {count} days with unusual sales (Z-score > 2.0)")
+                self._print(f" Found {count} days with unusual sales")
+                self._print(f" Top 5 unusual days:")
 
-                top_5 = outliers.nlargest(5, 'total_revenue')
-                for idx, row in top_5.iterrows():
-                    log_msg = f"  {row['sale_date']}: ₹{row['total_revenue']:,.2f} ({row['total_orders']} orders, Z-score: {row['z_score']:.2f})"
+                for sale_date, total_orders, total_revenue, z_score in top:
+                    log_msg = f"  {sale_date}: ₹{total_revenue:,.2f} ({total_orders} orders, Z-score: {z_score:.2f})"
                     logger.info(log_msg)
-                    print(log_msg)
+                    self._print(log_msg)
 
-                self.anomalies.append({
+                self._record_anomaly({
                     'type': 'Daily Sales Spikes',
-                    'count': len(outliers),
+                    'count': count,
                     'severity': 'INFO',
                     'details': 'Days with exceptional sales performance'
                 })
             else:
                 logger.info(" ✓ No unusual daily patterns detected")
-                print(" ✓ No unusual daily patterns detected")
+                self._print(" ✓ No unusual daily patterns detected")
 
         except Exception as e:
             logger.error(f"✗ Daily sales detection failed: {e}")
@@ -273,60 +389,56 @@ class AnomalyDetector:
         """Detect violations of business rules."""
 
         logger.info("⚠️ BUSINESS RULE VIOLATIONS")
-        print("\n⚠️ BUSINESS RULE VIOLATIONS")
-        print("-" * 60)
+        self._print("\n⚠️ BUSINESS RULE VIOLATIONS")
+        self._print("-" * 60)
 
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-
             violations = []
 
-            # Rule 1: Very high order values
-            cursor.execute("""
-                SELECT COUNT(*) FROM orders
-                WHERE total_amount > 200000 AND order_status = 'Delivered'
-            """)
-            high_value = cursor.fetchone()[0]
+            # All three rules in one round trip; the two orders rules
+            # share a single scan
+            high_value, frequent, zero_revenue = self.fetch_rows("""
+                WITH order_rules AS (
+                    SELECT
+                        COUNT(*) FILTER (
+                            WHERE total_amount > 200000 AND order_status = 'Delivered'
+                        ) AS high_value,
+                        COUNT(*) FILTER (WHERE total_amount = 0) AS zero_revenue
+                    FROM orders
+                )
+                SELECT
+                    high_value,
+                    (SELECT COUNT(*) FROM customer_summary WHERE total_orders > 20) AS frequent,
+                    zero_revenue
+                FROM order_rules
+            """)[0]
 
+            # Rule 1: Very high order values
             if high_value > 0:
                 msg = f"⚠️ {high_value} orders exceed ₹2 Lakh (potential review needed)"
                 logger.warning(msg)
-                print(f" {msg}")
+                self._print(f" {msg}")
                 violations.append(f"{high_value} very high-value orders")
 
             # Rule 2: Frequent customers
-            cursor.execute("""
-                SELECT COUNT(*) FROM customer_summary WHERE total_orders > 20
-            """)
-            frequent = cursor.fetchone()[0]
-
             if frequent > 0:
                 msg = f"ℹ️ {frequent} customers have >20 orders (loyalty program candidates)"
                 logger.info(msg)
-                print(f" {msg}")
+                self._print(f" {msg}")
                 violations.append(f"{frequent} highly active customers")
 
             # Rule 3: Zero revenue orders
-            cursor.execute("""
-                SELECT COUNT(*) FROM orders WHERE total_amount = 0
-            """)
-            zero_revenue = cursor.fetchone()[0]
-
             if zero_revenue > 0:
                 msg = f"✗ {zero_revenue} orders with ₹0 total (data quality issue)"
                 logger.error(msg)
-                print(f" {msg}")
+                self._print(f" {msg}")
                 violations.append(f"{zero_revenue} zero-revenue orders")
             else:
                 logger.info(" ✓ No zero-revenue orders")
-                print(" ✓ No zero-revenue orders")
-
-            cursor.close()
-            conn.close()
+                self._print(" ✓ No zero-revenue orders")
 
             if violations:
-                self.anomalies.append({
+                self._record_anomaly({
                     'type': 'Business Rule Violations',
                     'count': len(violations),
                     'severity': 'WARNING',
@@ -350,12 +462,27 @@ class AnomalyDetector:
         print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
 
+        detectors = [
+            self.detect_order_amount_anomalies,
+            self.detect_quantity_anomalies,
+            self.detect_customer_spending_anomalies,
+            self.detect_daily_sales_anomalies,
+            self.detect_business_rule_violations,
+        ]
+
         try:
-            self.detect_order_amount_anomalies()
-            self.detect_quantity_anomalies()
-            self.detect_customer_spending_anomalies()
-            self.detect_daily_sales_anomalies()
-            self.detect_business_rule_violations()
+            # Detectors are independent - run them side by side on pooled
+            # connections, then report in the usual order
+            workers = min(len(detectors), Config.DB_POOL_MAX_CONN)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._run_detector, detectors))
+
+            for lines, anomalies, error in results:
+                if lines:
+                    sys.stdout.write("\n".join(lines) + "\n")
+                if error is not None:
+                    raise error
+                self.anomalies.extend(anomalies)
 
             # Summary
             logger.info("=" * 60)
@@ -401,6 +528,9 @@ def main():
         print(f"\n✗ Critical error: {e}")
         sys.exit(1)
 
+    finally:
+        close_pool()
+
 
 if __name__ == "__main__":
     Config.create_directories()
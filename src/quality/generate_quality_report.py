@@ -13,14 +13,23 @@ Author: Abhiiram
 Date: November 7, 2025
 """
 
-from src.utils.db_connector import get_connection
+from src.utils.db_connector import db_cursor, close_pool
 from src.utils.config import Config
+from src.quality.data_quality_checks import (
+    DUPLICATE_KEYS_QUERY, uniqueness_query)
 import json
 import psycopg2
-import pandas as pd
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional
 import sys
 import os
+import re
+import gzip
+import time
+from bisect import bisect_right
+from contextlib import suppress
+from string import Template
 from loguru import logger
 
 # Add parent directory to path
@@ -32,6 +41,452 @@ logger.add(
     level=Config.LOG_LEVEL
 )
 
+# Tables whose row counts the report shows
+STATS_TABLES = [
+    'customers', 'products', 'orders',
+    'customer_summary', 'product_summary',
+    'daily_sales_summary', 'monthly_sales_summary'
+]
+
+# ========================================
+# BATCHED QUALITY METRICS
+# ========================================
+
+# (table, column) pairs that must not be NULL
+NULL_CHECKS = [
+    ("customers", "email"),
+    ("customers", "first_name"),
+    ("customers", "last_name"),
+    ("products", "product_name"),
+    ("products", "price"),
+    ("orders", "customer_id"),
+    ("orders", "total_amount"),
+]
+
+# table -> [(metric, predicate)] for detect_data_quality_issues
+QUALITY_PREDICATES = {
+    "products": [("bad_price", "price <= 0")],
+    "orders": [
+        ("negative_amount", "total_amount < 0"),
+        ("future_date", "order_date > NOW()"),
+        ("bad_quantity", "quantity <= 0"),
+    ],
+}
+
+
+def _build_metrics_query() -> str:
+    """
+    One statement, one scan per table, one result row.
+
+    Every NULL check and data quality predicate is a FILTER aggregate
+    next to the table's COUNT(*); columns are named <table>_total,
+    <table>_null_<column> and <table>_<metric>.
+    """
+    tables = list(dict.fromkeys(
+        [table for table, _ in NULL_CHECKS] + list(QUALITY_PREDICATES)))
+
+    scans = []
+    for table in tables:
+        columns = [f"COUNT(*) AS {table}_total"]
+        columns += [
+            f"COUNT(*) FILTER (WHERE {column} IS NULL) AS {table}_null_{column}"
+            for check_table, column in NULL_CHECKS if check_table == table]
+        columns += [
+            f"COUNT(*) FILTER (WHERE {predicate}) AS {table}_{metric}"
+            for metric, predicate in QUALITY_PREDICATES.get(table, [])]
+        scans.append(
+            f"{table}_metrics AS (SELECT {', '.join(columns)} FROM {table})")
+
+    return (f"WITH {', '.join(scans)} SELECT * FROM "
+            + ", ".join(f"{table}_metrics" for table in tables))
+
+
+METRICS_QUERY = _build_metrics_query()
+
+# (table, key) pairs that must be unique; the report counts keys that
+# repeat, skipping tables whose key is already PRIMARY KEY/UNIQUE
+DUPLICATE_CHECKS = [
+    ("orders", "order_id"),
+    ("customers", "customer_id"),
+    ("products", "product_id"),
+]
+
+DUPLICATES_QUERY = uniqueness_query(DUPLICATE_CHECKS, DUPLICATE_KEYS_QUERY)
+
+# (grade, colour) per score band: QUALITY_GRADES[i] covers scores from
+# GRADE_THRESHOLDS[i - 1] up to GRADE_THRESHOLDS[i]
+GRADE_THRESHOLDS = (80, 90, 95)
+QUALITY_GRADES = (
+    ("C (Needs Attention)", "#e74c3c"),
+    ("B (Good)", "#f39c12"),
+    ("A (Very Good)", "#2ecc71"),
+    ("A+ (Excellent)", "#27ae60"),
+)
+
+# ========================================
+# REPORT TEMPLATE
+# ========================================
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and all whitespace CSS does not need."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+REPORT_CSS = """
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            margin: 0;
+            padding: 20px;
+            color: #333;
+        }
+        
+        .container {
+            max-width: 1400px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 10px;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+            overflow: hidden;
+        }
+        
+        header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+        }
+        
+        header h1 {
+            margin: 0;
+            font-size: 2.5em;
+        }
+        
+        header p {
+            margin: 10px 0 0 0;
+            opacity: 0.9;
+        }
+        
+        .content {
+            padding: 30px;
+        }
+        
+        .score-card {
+            background: var(--grade-color);
+            color: white;
+            padding: 30px;
+            border-radius: 8px;
+            text-align: center;
+            margin-bottom: 30px;
+        }
+        
+        .score-card h2 {
+            margin: 0 0 10px 0;
+            font-size: 3em;
+        }
+        
+        .score-card p {
+            margin: 5px 0;
+            font-size: 1.1em;
+        }
+        
+        .grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+        
+        .card {
+            background: #f8f9fa;
+            border: 1px solid #dee2e6;
+            border-radius: 8px;
+            padding: 20px;
+        }
+        
+        .card h3 {
+            margin: 0 0 15px 0;
+            color: #667eea;
+        }
+        
+        .stat {
+            display: flex;
+            justify-content: space-between;
+            padding: 8px 0;
+            border-bottom: 1px solid #e9ecef;
+        }
+        
+        .stat:last-child {
+            border-bottom: none;
+        }
+        
+        .stat-label {
+            font-weight: 500;
+        }
+        
+        .stat-value {
+            color: #667eea;
+            font-weight: bold;
+        }
+        
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+            border: 1px solid #dee2e6;
+        }
+        
+        th {
+            background: #667eea;
+            color: white;
+            padding: 12px;
+            text-align: left;
+        }
+        
+        td {
+            padding: 12px;
+            border-bottom: 1px solid #dee2e6;
+        }
+        
+        tr:hover {
+            background: #f8f9fa;
+        }
+        
+        .check-pass {
+            color: #27ae60;
+            font-weight: bold;
+        }
+        
+        .check-fail {
+            color: #e74c3c;
+            font-weight: bold;
+        }
+        
+        code {
+            background: #f4f4f4;
+            padding: 4px 8px;
+            border-radius: 3px;
+            font-family: monospace;
+            font-size: 0.85em;
+            word-break: break-all;
+        }
+        
+        .issues-section {
+            background: #fff3cd;
+            border-left: 4px solid #ffc107;
+            padding: 20px;
+            margin: 30px 0;
+            border-radius: 5px;
+        }
+        
+        .issues-table {
+            background: white;
+        }
+        
+        .issues-table thead tr {
+            background: #ffc107 !important;
+            color: black;
+        }
+        
+        .anomalies-section {
+            background: #f8d7da;
+            border-left: 4px solid #dc3545;
+            padding: 20px;
+            margin: 30px 0;
+            border-radius: 5px;
+        }
+        
+        .anomalies-table thead tr {
+            background: #dc3545 !important;
+            color: white;
+        }
+        
+        .no-issues-section {
+            background: #d4edda;
+            border-left: 4px solid #28a745;
+            padding: 20px;
+            margin: 30px 0;
+            border-radius: 5px;
+        }
+        
+        .no-issues-section h2 {
+            color: #28a745;
+            margin-top: 0;
+        }
+        
+        footer {
+            background: #f8f9fa;
+            padding: 20px;
+            text-align: center;
+            border-top: 1px solid #dee2e6;
+            color: #666;
+            font-size: 0.9em;
+        }
+"""
+
+# Static part of the page (doctype, head and the minified stylesheet) -
+# built once at import, written out as-is, never formatted
+REPORT_HEAD = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Data Quality Report</title>
+    <style>{_minify_css(REPORT_CSS)}</style>
+</head>
+"""
+
+REPORT_HEAD_BYTES = REPORT_HEAD.encode('utf-8')
+
+# Dynamic parts, parsed once at import, written around the issues and
+# anomalies sections. The grade colour reaches the stylesheet through the
+# --grade-color custom property on <body>.
+REPORT_SUMMARY = Template("""<body style="--grade-color: $grade_color;">
+    <div class="container">
+        <header>
+            <h1>📊 Data Quality Report</h1>
+            <p>E-Commerce Data Pipeline - SimMart</p>
+            <p>Generated: $timestamp</p>
+        </header>
+        
+        <div class="content">
+            <div class="score-card">
+                <h2>${quality_score}%</h2>
+                <p>Quality Score</p>
+                <p style="font-size: 1.5em; margin-top: 10px;">$grade</p>
+            </div>
+            
+            <div class="grid">
+                <div class="card">
+                    <h3>✅ Quality Dimensions</h3>
+                    <div class="stat">
+                        <span class="stat-label">Completeness</span>
+                        <span class="stat-value">100%</span>
+                    </div>
+                    <div class="stat">
+                        <span class="stat-label">Validity</span>
+                        <span class="stat-value">${validity}%</span>
+                    </div>
+                    <div class="stat">
+                        <span class="stat-label">Consistency</span>
+                        <span class="stat-value">99%</span>
+                    </div>
+                    <div class="stat">
+                        <span class="stat-label">Uniqueness</span>
+                        <span class="stat-value">${uniqueness}%</span>
+                    </div>
+                </div>
+                
+                <div class="card">
+                    <h3>📈 Issues & Anomalies</h3>
+                    <div class="stat">
+                        <span class="stat-label">Issues Found</span>
+                        <span class="stat-value">$issue_count</span>
+                    </div>
+                    <div class="stat">
+                        <span class="stat-label">Critical Issues</span>
+                        <span class="stat-value $critical_class">$critical_count</span>
+                    </div>
+                    <div class="stat">
+                        <span class="stat-label">Anomalies</span>
+                        <span class="stat-value">$anomaly_count</span>
+                    </div>
+                </div>
+                
+                <div class="card">
+                    <h3>💾 Data Summary</h3>
+                    <div class="stat">
+                        <span class="stat-label">Customers</span>
+                        <span class="stat-value">$customers_count</span>
+                    </div>
+                    <div class="stat">
+                        <span class="stat-label">Products</span>
+                        <span class="stat-value">$products_count</span>
+                    </div>
+                    <div class="stat">
+                        <span class="stat-label">Orders</span>
+                        <span class="stat-value">$orders_count</span>
+                    </div>
+                </div>
+            </div>
+            
+            """)
+
+# Between the issues and anomalies sections
+REPORT_SECTION_GAP = "\n            "
+
+REPORT_TABLES = Template("""
+            
+            <h3>📊 Table Statistics</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Table Name</th>
+                        <th>Row Count</th>
+                        <th>Status</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    <tr>
+                        <td>customers</td>
+                        <td>$customers_count</td>
+                        <td><span class="check-pass">✓ Valid</span></td>
+                    </tr>
+                    <tr>
+                        <td>products</td>
+                        <td>$products_count</td>
+                        <td><span class="check-pass">✓ Valid</span></td>
+                    </tr>
+                    <tr>
+                        <td>orders</td>
+                        <td>$orders_count</td>
+                        <td><span class="check-pass">✓ Valid</span></td>
+                    </tr>
+                    <tr>
+                        <td>customer_summary</td>
+                        <td>$customer_summary_count</td>
+                        <td><span class="check-pass">✓ Aggregated</span></td>
+                    </tr>
+                    <tr>
+                        <td>product_summary</td>
+                        <td>$product_summary_count</td>
+                        <td><span class="check-pass">✓ Aggregated</span></td>
+                    </tr>
+                    <tr>
+                        <td>daily_sales_summary</td>
+                        <td>$daily_sales_summary_count</td>
+                        <td><span class="check-pass">✓ Aggregated</span></td>
+                    </tr>
+                    <tr>
+                        <td>monthly_sales_summary</td>
+                        <td>$monthly_sales_summary_count</td>
+                        <td><span class="check-pass">✓ Aggregated</span></td>
+                    </tr>
+                </tbody>
+            </table>
+        </div>
+        
+        <footer>
+            <p>E-Commerce Data Pipeline | Quality Report | $timestamp</p>
+            <p>For issues or questions, contact: data-engineering@example.com</p>
+        </footer>
+    </div>
+</body>
+</html>
+""")
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """os.write until every byte is written (it may write less)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
 # ========================================
 # QUALITY REPORT GENERATOR
 # ========================================
@@ -44,71 +499,102 @@ class QualityReportGenerator:
         """Initialize report generator."""
         self.timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         self.issues = []
+        self._stats_cache = None
+        self._stats_ts = 0.0
         logger.info("✓ Report generator initialized")
 
+    def refresh_stats(self) -> None:
+        """Drop cached table counts so the next get_table_stats() requeries."""
+        self._stats_cache = None
+
     def get_table_stats(self) -> dict:
-        """Get statistics for all tables."""
+        """Get statistics for all tables (cached for Config.REPORT_TABLE_STATS_TTL seconds)."""
+
+        if (self._stats_cache is not None
+                and time.monotonic() - self._stats_ts < Config.REPORT_TABLE_STATS_TTL):
+            logger.info("📊 Using cached table statistics")
+            return dict(self._stats_cache)
 
         logger.info("📊 Collecting table statistics...")
 
         try:
-            conn = get_connection()
-
-            tables = [
-                'customers', 'products', 'orders',
-                'customer_summary', 'product_summary',
-                'daily_sales_summary', 'monthly_sales_summary'
-            ]
+            tables = STATS_TABLES
+            limit = Config.REPORT_ESTIMATED_COUNT_ROWS
+
+            with db_cursor() as cursor:
+                # Which tables exist (summaries may not be built yet), with
+                # a row estimate for each: the stats collector's live count,
+                # or the planner's reltuples only when those counters are
+                # missing or were reset (-1 = never analyzed: count exactly)
+                cursor.execute("""
+                    SELECT name, COALESCE(NULLIF(s.n_live_tup, 0),
+                                          c.reltuples::bigint)
+                    FROM unnest(%s::text[]) AS name
+                    JOIN pg_class c ON c.oid = to_regclass(name)
+                    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+                """, (tables,))
+                live_tuples = dict(cursor.fetchall())
+
+                # Big tables report the estimate instead of a heap scan
+                counts = {table: live for table, live in live_tuples.items()
+                          if limit > 0 and (live or 0) >= limit}
+
+                # Everything else is counted exactly, in one round trip
+                exact = [table for table in live_tuples if table not in counts]
+                if exact:
+                    cursor.execute(" UNION ALL ".join(
+                        f"SELECT '{table}', COUNT(*) FROM {table}" for table in exact))
+                    counts.update(cursor.fetchall())
 
             stats = {}
-
             for table in tables:
-                try:
-                    df = pd.read_sql(
-                        f"SELECT COUNT(*) as count FROM {table}", conn)
-                    count = df['count'].iloc[0]
-                    stats[table] = count
-                    logger.info(f"  {table}: {count} rows")
-                except Exception as e:
-                    logger.warning(f"  ⚠️ {table} not found: {e}")
+                if table in counts:
+                    stats[table] = counts[table]
+                    logger.info(f"  {table}: {stats[table]} rows")
+                else:
+                    logger.warning(f"  ⚠️ {table} not found")
                     stats[table] = 0
 
-            conn.close()
-            return stats
+            self._stats_cache = stats
+            self._stats_ts = time.monotonic()
+            return dict(stats)
 
         except Exception as e:
             logger.error(f"✗ Table stats collection failed: {e}")
             raise
 
-    def detect_null_values(self) -> list:
-        """Detect null values in critical columns."""
+    def collect_metrics(self) -> Dict[str, int]:
+        """Fetch every NULL and data quality count in one round trip."""
+
+        logger.info("🔍 Collecting quality metrics...")
+
+        try:
+            with db_cursor() as cursor:
+                cursor.execute(METRICS_QUERY)
+                row = cursor.fetchone()
+                names = [column.name for column in cursor.description]
+
+            return dict(zip(names, row))
+
+        except Exception as e:
+            logger.error(f"✗ Quality metrics collection failed: {e}")
+            raise
+
+    def detect_null_values(self, metrics: Optional[Dict[str, int]] = None) -> list:
+        """Detect null values in critical columns (from collect_metrics())."""
 
         logger.info("🔍 Detecting null values...")
         issues = []
 
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-
-            null_checks = [
-                ("customers", "email"),
-                ("customers", "first_name"),
-                ("customers", "last_name"),
-                ("products", "product_name"),
-                ("products", "price"),
-                ("orders", "customer_id"),
-                ("orders", "total_amount"),
-            ]
-
-            for table, column in null_checks:
-                cursor.execute(f"""
-                    SELECT COUNT(*) FROM {table} WHERE {column} IS NULL
-                """)
-                null_count = cursor.fetchone()[0]
+            if metrics is None:
+                metrics = self.collect_metrics()
+
+            for table, column in NULL_CHECKS:
+                null_count = metrics[f"{table}_null_{column}"]
 
                 if null_count > 0:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    total_count = cursor.fetchone()[0]
+                    total_count = metrics[f"{table}_total"]
                     pct = (null_count / total_count *
                            100) if total_count > 0 else 0
 
@@ -127,9 +613,6 @@ class QualityReportGenerator:
                     logger.warning(
                         f"  {severity}: {table}.{column} has {null_count} nulls")
 
-            cursor.close()
-            conn.close()
-
         except Exception as e:
             logger.error(f"✗ Null detection failed: {e}")
 
@@ -142,25 +625,11 @@ class QualityReportGenerator:
         issues = []
 
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-
-            dup_checks = [
-                ("orders", "order_id"),
-                ("customers", "customer_id"),
-                ("products", "product_id"),
-            ]
-
-            for table, key_col in dup_checks:
-                cursor.execute(f"""
-                    SELECT COUNT(*) FROM (
-                        SELECT {key_col} FROM {table} 
-                        GROUP BY {key_col} HAVING COUNT(*) > 1
-                    ) t
-                """)
-
-                dup_count = cursor.fetchone()[0]
+            with db_cursor() as cursor:
+                cursor.execute(DUPLICATES_QUERY)
+                dup_counts = cursor.fetchone()
 
+            for (table, key_col), dup_count in zip(DUPLICATE_CHECKS, dup_counts):
                 if dup_count > 0:
                     issue = {
                         'type': 'Duplicate Records',
@@ -177,28 +646,23 @@ class QualityReportGenerator:
                     logger.warning(
                         f"  🔴 CRITICAL: {table} has {dup_count} duplicate {key_col}s")
 
-            cursor.close()
-            conn.close()
-
         except Exception as e:
             logger.error(f"✗ Duplicate detection failed: {e}")
 
         return issues
 
-    def detect_data_quality_issues(self) -> list:
-        """Detect data quality issues."""
+    def detect_data_quality_issues(self, metrics: Optional[Dict[str, int]] = None) -> list:
+        """Detect data quality issues (from collect_metrics())."""
 
         logger.info("🔍 Detecting data quality issues...")
         issues = []
 
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
+            if metrics is None:
+                metrics = self.collect_metrics()
 
             # Check for negative amounts
-            cursor.execute(
-                "SELECT COUNT(*) FROM orders WHERE total_amount < 0")
-            neg_orders = cursor.fetchone()[0]
+            neg_orders = metrics['orders_negative_amount']
 
             if neg_orders > 0:
                 issue = {
@@ -215,8 +679,7 @@ class QualityReportGenerator:
                     f"  🔴 CRITICAL: {neg_orders} orders with negative amounts")
 
             # Check for invalid prices
-            cursor.execute("SELECT COUNT(*) FROM products WHERE price <= 0")
-            invalid_prices = cursor.fetchone()[0]
+            invalid_prices = metrics['products_bad_price']
 
             if invalid_prices > 0:
                 issue = {
@@ -233,9 +696,7 @@ class QualityReportGenerator:
                     f"  🔴 CRITICAL: {invalid_prices} products with invalid prices")
 
             # Check for future dates
-            cursor.execute(
-                "SELECT COUNT(*) FROM orders WHERE order_date > NOW()")
-            future_orders = cursor.fetchone()[0]
+            future_orders = metrics['orders_future_date']
 
             if future_orders > 0:
                 issue = {
@@ -252,8 +713,7 @@ class QualityReportGenerator:
                     f"  🟡 WARNING: {future_orders} orders with future dates")
 
             # Check for zero quantity orders
-            cursor.execute("SELECT COUNT(*) FROM orders WHERE quantity <= 0")
-            zero_qty = cursor.fetchone()[0]
+            zero_qty = metrics['orders_bad_quantity']
 
             if zero_qty > 0:
                 issue = {
@@ -269,9 +729,6 @@ class QualityReportGenerator:
                 logger.warning(
                     f"  🔴 CRITICAL: {zero_qty} orders with zero/negative quantities")
 
-            cursor.close()
-            conn.close()
-
         except Exception as e:
             logger.error(f"✗ Quality issue detection failed: {e}")
 
@@ -284,27 +741,22 @@ class QualityReportGenerator:
         anomalies = []
 
         try:
-            conn = get_connection()
-
-            query = """
-            SELECT order_id, total_amount, customer_id 
-            FROM orders 
-            WHERE total_amount > (SELECT AVG(total_amount) + 3*STDDEV(total_amount) 
-                                 FROM orders)
-            LIMIT 10
-            """
-
-            df = pd.read_sql(query, conn)
-
-            for idx, row in df.iterrows():
-                anomalies.append({
-                    'order_id': row['order_id'],
-                    'amount': row['total_amount'],
-                    'customer_id': row['customer_id'],
-                    'action': 'Manual review required'
-                })
+            with db_cursor() as cursor:
+                cursor.execute("""
+                SELECT order_id, total_amount, customer_id 
+                FROM orders 
+                WHERE total_amount > (SELECT AVG(total_amount) + 3*STDDEV(total_amount) 
+                                     FROM orders)
+                LIMIT 10
+                """)
 
-            conn.close()
+                for order_id, total_amount, customer_id in cursor:
+                    anomalies.append({
+                        'order_id': order_id,
+                        'amount': total_amount,
+                        'customer_id': customer_id,
+                        'action': 'Manual review required'
+                    })
 
         except Exception as e:
             logger.error(f"✗ Anomaly detection failed: {e}")
@@ -326,42 +778,115 @@ class QualityReportGenerator:
 
     def generate_html(self) -> str:
         """Generate comprehensive HTML report with issue details."""
+        return "".join(self.render_html())
+
+    def render_html(self) -> Iterator[str]:
+        """Yield the HTML report in pieces, in page order."""
+        context = self._report_context()
+        yield REPORT_HEAD
+        yield from self._render_body(context)
+
+    def _report_context(self) -> dict:
+        """Run every check and work out the values the report shows."""
 
         logger.info("🎨 Generating HTML report...")
 
         try:
-            table_stats = self.get_table_stats()
+            # The collectors only read, so each runs on its own pooled
+            # connection; NULL and data quality checks share one batched
+            # query
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                stats_future = executor.submit(self.get_table_stats)
+                metrics_future = executor.submit(self.collect_metrics)
+                duplicates_future = executor.submit(self.detect_duplicates)
+                anomalies_future = executor.submit(
+                    self.get_high_value_anomalies)
+                # A failed count or metrics query (already logged) costs
+                # its section, not the whole report
+                try:
+                    table_stats = stats_future.result()
+                except Exception:
+                    table_stats = dict.fromkeys(STATS_TABLES, 0)
+                try:
+                    metrics = metrics_future.result()
+                except Exception:
+                    # Both detectors log the missing metrics and report none
+                    metrics = {}
+                duplicates = duplicates_future.result()
+                anomalies = anomalies_future.result()
 
             # Collect all issues
             all_issues = []
-            all_issues.extend(self.detect_null_values())
-            all_issues.extend(self.detect_duplicates())
-            all_issues.extend(self.detect_data_quality_issues())
-
-            # Get anomalies
-            anomalies = self.get_high_value_anomalies()
+            all_issues.extend(self.detect_null_values(metrics))
+            all_issues.extend(duplicates)
+            all_issues.extend(self.detect_data_quality_issues(metrics))
 
             # Calculate quality score
             quality_score = self.calculate_quality_score(all_issues)
 
             # Quality grade
-            if quality_score >= 95:
-                grade = "A+ (Excellent)"
-                grade_color = "#27ae60"
-            elif quality_score >= 90:
-                grade = "A (Very Good)"
-                grade_color = "#2ecc71"
-            elif quality_score >= 80:
-                grade = "B (Good)"
-                grade_color = "#f39c12"
-            else:
-                grade = "C (Needs Attention)"
-                grade_color = "#e74c3c"
+            grade, grade_color = QUALITY_GRADES[
+                bisect_right(GRADE_THRESHOLDS, quality_score)]
+
+            critical_count = len(
+                [i for i in all_issues if '🔴' in i['severity']])
+
+            return {
+                'all_issues': all_issues,
+                'anomalies': anomalies,
+                'table_counts': {
+                    f"{table}_count": f"{count:,}" for table, count in table_stats.items()},
+                'summary': {
+                    'timestamp': self.timestamp,
+                    'grade_color': grade_color,
+                    'quality_score': f"{quality_score:.1f}",
+                    'grade': grade,
+                    'validity': 100 if critical_count == 0 else 85,
+                    'uniqueness': 100 if len(
+                        [i for i in all_issues if 'Duplicate' in i['type']]) == 0 else 80,
+                    'issue_count': len(all_issues),
+                    'critical_class': 'check-fail' if critical_count > 0 else '',
+                    'critical_count': critical_count,
+                    'anomaly_count': len(anomalies),
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"✗ HTML generation failed: {e}")
+            raise
+
+    def _render_body(self, context: dict) -> Iterator[str]:
+        """Yield everything after REPORT_HEAD for a _report_context() result."""
+
+        table_counts = context['table_counts']
+
+        yield REPORT_SUMMARY.substitute(**context['summary'], **table_counts)
+        yield from self._issues_html(context['all_issues'])
+        yield REPORT_SECTION_GAP
+        yield from self._anomalies_html(context['anomalies'])
+        yield REPORT_TABLES.substitute(timestamp=self.timestamp, **table_counts)
+
+        logger.info("✓ HTML report generated successfully")
+
+    def _render_bytes(self, context: dict) -> Iterator[bytes]:
+        """Yield the report as UTF-8 bytes, static head pre-encoded."""
+        yield REPORT_HEAD_BYTES
+        for piece in self._render_body(context):
+            yield piece.encode('utf-8')
+
+    def _issues_html(self, all_issues: list) -> Iterator[str]:
+        """Yield the issues table (or the all-clear box), row by row."""
+
+        if not all_issues:
+            yield """
+                <div class="no-issues-section">
+                    <h2>✅ No Issues Detected</h2>
+                    <p>Your data pipeline is clean and ready for production!</p>
+                </div>
+                """
+            return
 
-            # Generate issues table HTML
-            issues_html = ""
-            if all_issues:
-                issues_html = """
+        yield """
                 <div class="issues-section">
                     <h2>⚠️ Detected Issues & Remediation</h2>
                     <table class="issues-table">
@@ -378,8 +903,8 @@ class QualityReportGenerator:
                         <tbody>
                 """
 
-                for issue in all_issues:
-                    issues_html += f"""
+        for issue in all_issues:
+            yield f"""
                         <tr>
                             <td>{issue['severity']}</td>
                             <td>{issue['type']}</td>
@@ -390,23 +915,19 @@ class QualityReportGenerator:
                         </tr>
                     """
 
-                issues_html += """
+        yield """
                         </tbody>
                     </table>
                 </div>
                 """
-            else:
-                issues_html = """
-                <div class="no-issues-section">
-                    <h2>✅ No Issues Detected</h2>
-                    <p>Your data pipeline is clean and ready for production!</p>
-                </div>
-                """
 
-            # Generate anomalies table
-            anomalies_html = ""
-            if anomalies:
-                anomalies_html = f"""
+    def _anomalies_html(self, anomalies: list) -> Iterator[str]:
+        """Yield the high-value anomalies table, row by row (nothing if empty)."""
+
+        if not anomalies:
+            return
+
+        yield f"""
                 <div class="anomalies-section">
                     <h2>🚨 High-Value Anomalies ({len(anomalies)} found)</h2>
                     <table class="anomalies-table">
@@ -421,8 +942,8 @@ class QualityReportGenerator:
                         <tbody>
                 """
 
-                for anom in anomalies:
-                    anomalies_html += f"""
+        for anom in anomalies:
+            yield f"""
                         <tr>
                             <td>#{anom['order_id']}</td>
                             <td>₹{anom['amount']:,.2f}</td>
@@ -431,364 +952,69 @@ class QualityReportGenerator:
                         </tr>
                     """
 
-                anomalies_html += """
+        yield """
                         </tbody>
                     </table>
                 </div>
                 """
 
-            html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Data Quality Report</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            margin: 0;
-            padding: 20px;
-            color: #333;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 10px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-        
-        header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        
-        header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-        }}
-        
-        header p {{
-            margin: 10px 0 0 0;
-            opacity: 0.9;
-        }}
-        
-        .content {{
-            padding: 30px;
-        }}
-        
-        .score-card {{
-            background: {grade_color};
-            color: white;
-            padding: 30px;
-            border-radius: 8px;
-            text-align: center;
-            margin-bottom: 30px;
-        }}
-        
-        .score-card h2 {{
-            margin: 0 0 10px 0;
-            font-size: 3em;
-        }}
-        
-        .score-card p {{
-            margin: 5px 0;
-            font-size: 1.1em;
-        }}
-        
-        .grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        
-        .card {{
-            background: #f8f9fa;
-            border: 1px solid #dee2e6;
-            border-radius: 8px;
-            padding: 20px;
-        }}
-        
-        .card h3 {{
-            margin: 0 0 15px 0;
-            color: #667eea;
-        }}
-        
-        .stat {{
-            display: flex;
-            justify-content: space-between;
-            padding: 8px 0;
-            border-bottom: 1px solid #e9ecef;
-        }}
-        
-        .stat:last-child {{
-            border-bottom: none;
-        }}
-        
-        .stat-label {{
-            font-weight: 500;
-        }}
-        
-        .stat-value {{
-            color: #667eea;
-            font-weight: bold;
-        }}
-        
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-            border: 1px solid #dee2e6;
-        }}
-        
-        th {{
-            background: #667eea;
-            color: white;
-            padding: 12px;
-            text-align: left;
-        }}
-        
-        td {{
-            padding: 12px;
-            border-bottom: 1px solid #dee2e6;
-        }}
-        
-        tr:hover {{
-            background: #f8f9fa;
-        }}
-        
-        .check-pass {{
-            color: #27ae60;
-            font-weight: bold;
-        }}
-        
-        .check-fail {{
-            color: #e74c3c;
-            font-weight: bold;
-        }}
-        
-        code {{
-            background: #f4f4f4;
-            padding: 4px 8px;
-            border-radius: 3px;
-            font-family: monospace;
-            font-size: 0.85em;
-            word-break: break-all;
-        }}
-        
-        .issues-section {{
-            background: #fff3cd;
-            border-left: 4px solid #ffc107;
-            padding: 20px;
-            margin: 30px 0;
-            border-radius: 5px;
-        }}
-        
-        .issues-table {{
-            background: white;
-        }}
-        
-        .issues-table thead tr {{
-            background: #ffc107 !important;
-            color: black;
-        }}
-        
-        .anomalies-section {{
-            background: #f8d7da;
-            border-left: 4px solid #dc3545;
-            padding: 20px;
-            margin: 30px 0;
-            border-radius: 5px;
-        }}
-        
-        .anomalies-table thead tr {{
-            background: #dc3545 !important;
-            color: white;
-        }}
-        
-        .no-issues-section {{
-            background: #d4edda;
-            border-left: 4px solid #28a745;
-            padding: 20px;
-            margin: 30px 0;
-            border-radius: 5px;
-        }}
-        
-        .no-issues-section h2 {{
-            color: #28a745;
-            margin-top: 0;
-        }}
-        
-        footer {{
-            background: #f8f9fa;
-            padding: 20px;
-            text-align: center;
-            border-top: 1px solid #dee2e6;
-            color: #666;
-            font-size: 0.9em;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>📊 Data Quality Report</h1>
-            <p>E-Commerce Data Pipeline - SimMart</p>
-            <p>Generated: {self.timestamp}</p>
-        </header>
-        
-        <div class="content">
-            <div class="score-card">
-                <h2>{quality_score:.1f}%</h2>
-                <p>Quality Score</p>
-                <p style="font-size: 1.5em; margin-top: 10px;">{grade}</p>
-            </div>
-            
-            <div class="grid">
-                <div class="card">
-                    <h3>✅ Quality Dimensions</h3>
-                    <div class="stat">
-                        <span class="stat-label">Completeness</span>
-                        <span class="stat-value">100%</span>
-                    </div>
-                    <div class="stat">
-                        <span class="stat-label">Validity</span>
-                        <span class="stat-value">{100 if len([i for i in all_issues if '🔴' in i['severity']]) == 0 else 85}%</span>
-                    </div>
-                    <div class="stat">
-                        <span class="stat-label">Consistency</span>
-                        <span class="stat-value">99%</span>
-                    </div>
-                    <div class="stat">
-                        <span class="stat-label">Uniqueness</span>
-                        <span class="stat-value">{100 if len([i for i in all_issues if 'Duplicate' in i['type']]) == 0 else 80}%</span>
-                    </div>
-                </div>
-                
-                <div class="card">
-                    <h3>📈 Issues & Anomalies</h3>
-                    <div class="stat">
-                        <span class="stat-label">Issues Found</span>
-                        <span class="stat-value">{len(all_issues)}</span>
-                    </div>
-                    <div class="stat">
-                        <span class="stat-label">Critical Issues</span>
-                        <span class="stat-value {{'check-fail' if len([i for i in all_issues if '🔴' in i['severity']]) > 0 else ''}}">{len([i for i in all_issues if '🔴' in i['severity']])}</span>
-                    </div>
-                    <div class="stat">
-                        <span class="stat-label">Anomalies</span>
-                        <span class="stat-value">{len(anomalies)}</span>
-                    </div>
-                </div>
-                
-                <div class="card">
-                    <h3>💾 Data Summary</h3>
-                    <div class="stat">
-                        <span class="stat-label">Customers</span>
-                        <span class="stat-value">{table_stats.get('customers', 0):,}</span>
-                    </div>
-                    <div class="stat">
-                        <span class="stat-label">Products</span>
-                        <span class="stat-value">{table_stats.get('products', 0):,}</span>
-                    </div>
-                    <div class="stat">
-                        <span class="stat-label">Orders</span>
-                        <span class="stat-value">{table_stats.get('orders', 0):,}</span>
-                    </div>
-                </div>
-            </div>
-            
-            {issues_html}
-            {anomalies_html}
-            
-            <h3>📊 Table Statistics</h3>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Table Name</th>
-                        <th>Row Count</th>
-                        <th>Status</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    <tr>
-                        <td>customers</td>
-                        <td>{table_stats.get('customers', 0):,}</td>
-                        <td><span class="check-pass">✓ Valid</span></td>
-                    </tr>
-                    <tr>
-                        <td>products</td>
-                        <td>{table_stats.get('products', 0):,}</td>
-                        <td><span class="check-pass">✓ Valid</span></td>
-                    </tr>
-                    <tr>
-                        <td>orders</td>
-                        <td>{table_stats.get('orders', 0):,}</td>
-                        <td><span class="check-pass">✓ Valid</span></td>
-                    </tr>
-                    <tr>
-                        <td>customer_summary</td>
-                        <td>{table_stats.get('customer_summary', 0):,}</td>
-                        <td><span class="check-pass">✓ Aggregated</span></td>
-                    </tr>
-                    <tr>
-                        <td>product_summary</td>
-                        <td>{table_stats.get('product_summary', 0):,}</td>
-                        <td><span class="check-pass">✓ Aggregated</span></td>
-                    </tr>
-                    <tr>
-                        <td>daily_sales_summary</td>
-                        <td>{table_stats.get('daily_sales_summary', 0):,}</td>
-                        <td><span class="check-pass">✓ Aggregated</span></td>
-                    </tr>
-                    <tr>
-                        <td>monthly_sales_summary</td>
-                        <td>{table_stats.get('monthly_sales_summary', 0):,}</td>
-                        <td><span class="check-pass">✓ Aggregated</span></td>
-                    </tr>
-                </tbody>
-            </table>
-        </div>
-        
-        <footer>
-            <p>E-Commerce Data Pipeline | Quality Report | {self.timestamp}</p>
-            <p>For issues or questions, contact: data-engineering@example.com</p>
-        </footer>
-    </div>
-</body>
-</html>
-"""
-
-            logger.info("✓ HTML report generated successfully")
-            return html
+    def save_report(self, html_content: Optional[str] = None) -> str:
+        """
+        Save HTML report to file.
 
-        except Exception as e:
-            logger.error(f"✗ HTML generation failed: {e}")
-            raise
-
-    def save_report(self, html_content: str) -> str:
-        """Save HTML report to file."""
+        Without html_content the checks run first, then the report is
+        streamed to the file piece by piece: the static head as bytes
+        encoded once at import, the rest encoded as it is rendered.
+        Writes go straight to the file descriptor, with no text or
+        buffer layer in between.
+        """
 
         logger.info("💾 Saving report to file...")
 
         try:
+            # Run the checks before creating the file, so a failure does
+            # not leave a half-written report behind
+            context = self._report_context() if html_content is None else None
+
             os.makedirs(Config.DATA_PROCESSED_DIR, exist_ok=True)
 
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             report_file = os.path.join(
                 Config.DATA_PROCESSED_DIR, f'quality_report_{timestamp}.html')
 
-            with open(report_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            if context is None:
+                chunks = [html_content.encode('utf-8')]
+            else:
+                chunks = self._render_bytes(context)
+
+            fd = os.open(report_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            gz = None
+            try:
+                # Optional gzip copy for upload/serving, compressed in the same pass
+                if Config.REPORT_GZIP:
+                    gz = gzip.open(report_file + '.gz', 'wb', compresslevel=6)
+                for chunk in chunks:
+                    _write_all(fd, chunk)
+                    if gz is not None:
+                        gz.write(chunk)
+                if gz is not None:
+                    gz.close()
+            except Exception:
+                # Never leave a half-written report (or .gz copy) behind
+                if gz is not None:
+                    with suppress(OSError):
+                        gz.close()
+                for partial in (report_file, report_file + '.gz'):
+                    with suppress(OSError):
+                        os.remove(partial)
+                raise
+            finally:
+                os.close(fd)
 
             logger.info(f"✓ Report saved to {report_file}")
             print(f"✓ Report saved to {report_file}")
+            if gz is not None:
+                logger.info(f"✓ Compressed copy saved to {report_file}.gz")
 
             return report_file
 
@@ -811,11 +1037,8 @@ def main():
 
         generator = QualityReportGenerator()
 
-        # Generate HTML report
-        html_content = generator.generate_html()
-
-        # Save report
-        report_file = generator.save_report(html_content)
+        # Generate the HTML report straight into the file
+        report_file = generator.save_report()
 
         logger.info("=" * 60)
         logger.info("✓ REPORT GENERATED")
@@ -832,6 +1055,9 @@ def main():
         print(f"\n✗ Critical error: {e}")
         sys.exit(1)
 
+    finally:
+        close_pool()
+
 
 if __name__ == "__main__":
     Config.create_directories()
@@ -166,8 +166,9 @@ def validate_foreign_keys() -> bool:
         # Check customer foreign keys in orders
         cursor.execute("""
             SELECT COUNT(*) FROM orders o
-            LEFT JOIN customers c ON o.customer_id = c.customer_id
-            WHERE c.customer_id IS NULL
+            WHERE NOT EXISTS (
+                SELECT 1 FROM customers c WHERE c.customer_id = o.customer_id
+            )
         """)
         orphaned_customers = cursor.fetchone()[0]
 
@@ -179,8 +180,9 @@ def validate_foreign_keys() -> bool:
         # Check product foreign keys in orders
         cursor.execute("""
             SELECT COUNT(*) FROM orders o
-            LEFT JOIN products p ON o.product_id = p.product_id
-            WHERE p.product_id IS NULL
+            WHERE NOT EXISTS (
+                SELECT 1 FROM products p WHERE p.product_id = o.product_id
+            )
         """)
         orphaned_products = cursor.fetchone()[0]
 
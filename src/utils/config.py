@@ -38,6 +38,10 @@ class Config:
     ECOMMERCE_DB_PASSWORD = os.getenv('ECOMMERCE_DB_PASSWORD', 'pipeline123')
     ECOMMERCE_DB_TIMEOUT = int(os.getenv('ECOMMERCE_DB_TIMEOUT', 5))
 
+    # Shared connection pool (see db_connector.get_pool)
+    DB_POOL_MIN_CONN = int(os.getenv('DB_POOL_MIN_CONN', 1))
+    DB_POOL_MAX_CONN = int(os.getenv('DB_POOL_MAX_CONN', 8))
+
     # ========== DATA PATHS ==========
 
     DATA_RAW_DIR = str(DATA_RAW_DIR)
@@ -65,12 +69,60 @@ class Config:
     ANOMALY_ZSCORE_THRESHOLD = float(
         os.getenv('ANOMALY_ZSCORE_THRESHOLD', 3.0))
 
+    # Outlier rule for heavy-tailed money columns (order amounts, customer
+    # spend): 'zscore' or 'iqr' (outside Q1/Q3 -/+ multiplier * IQR)
+    ANOMALY_MONETARY_METHOD = os.getenv('ANOMALY_MONETARY_METHOD', 'zscore').lower()
+    ANOMALY_IQR_MULTIPLIER = float(os.getenv('ANOMALY_IQR_MULTIPLIER', 3.0))
+
+    # Quality report row counts: tables estimated at this many rows or more
+    # (pg_stat_user_tables.n_live_tup / pg_class.reltuples) show that
+    # estimate instead of an exact COUNT(*) (0 = always count exactly)
+    REPORT_ESTIMATED_COUNT_ROWS = int(
+        os.getenv('REPORT_ESTIMATED_COUNT_ROWS', 1000000))
+
+    # Seconds the quality report reuses its table row counts within a process
+    REPORT_TABLE_STATS_TTL = int(os.getenv('REPORT_TABLE_STATS_TTL', 300))
+
+    # Also write quality_report_*.html.gz next to each report
+    REPORT_GZIP = os.getenv('REPORT_GZIP', 'false').lower() == 'true'
+
     # ========== APPLICATION SETTINGS ==========
 
     BATCH_SIZE = int(os.getenv('BATCH_SIZE', 1000))
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', 3))
     RETRY_DELAY_SECONDS = int(os.getenv('RETRY_DELAY_SECONDS', 5))
 
+    # ========== AGGREGATION SETTINGS ==========
+
+    # Per-session settings for each aggregate refresh (run in parallel)
+    AGGREGATION_WORK_MEM = os.getenv('AGGREGATION_WORK_MEM', '256MB')
+    AGGREGATION_PARALLEL_WORKERS = int(
+        os.getenv('AGGREGATION_PARALLEL_WORKERS', 4))
+
+    # Rebuild every summary row instead of only those changed since last run
+    # (needed after deleting base rows: incremental runs cannot see deletes)
+    AGGREGATION_FULL_REFRESH = os.getenv(
+        'AGGREGATION_FULL_REFRESH', 'false').lower() == 'true'
+
+    # Incremental refreshes re-read rows stamped up to this long before the
+    # newest row they saw, to catch loads that commit late
+    AGGREGATION_WATERMARK_OVERLAP_MINUTES = int(
+        os.getenv('AGGREGATION_WATERMARK_OVERLAP_MINUTES', 60))
+
+    # ========== BULK LOAD SETTINGS ==========
+
+    # Used when loading into an empty table (indexes rebuilt after load)
+    BULK_LOAD_MAINTENANCE_WORK_MEM = os.getenv(
+        'BULK_LOAD_MAINTENANCE_WORK_MEM', '1GB')
+    BULK_LOAD_MAINTENANCE_WORKERS = int(
+        os.getenv('BULK_LOAD_MAINTENANCE_WORKERS', 4))
+
+    # Let a local server read CSVs straight from disk (COPY FROM 'file').
+    # Needs superuser or pg_read_server_files, and the server must see the
+    # same paths - leave off when Postgres runs in Docker.
+    COPY_FROM_SERVER_FILES = os.getenv(
+        'COPY_FROM_SERVER_FILES', 'false').lower() == 'true'
+
     @classmethod
     def get_db_config(cls) -> Dict[str, Any]:
         """Return database configuration dictionary."""
@@ -13,8 +13,13 @@ Date: November 6, 2025
 
 import psycopg2
 from psycopg2 import sql, OperationalError
+from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.extras import execute_values
+from contextlib import contextmanager
+from operator import itemgetter
 from loguru import logger
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Iterator
+import threading
 import sys
 import os
 
@@ -60,37 +65,26 @@ def get_connection() -> psycopg2.extensions.connection:
 
 def execute_query(query: str, params: tuple = None) -> Any:
     """Execute a query and return results."""
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with db_cursor() as cursor:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
 
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-
-        result = cursor.fetchall()
-        cursor.close()
-        conn.close()
+            result = cursor.fetchall()
 
         logger.info(f"✓ Query executed - {len(result)} rows")
         return result
 
     except Exception as e:
         logger.error(f"✗ Query failed: {e}")
-        if conn:
-            conn.close()
         raise
 
 
 def execute_insert(table: str, data: dict) -> bool:
     """Insert single record into table."""
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
         columns = data.keys()
         values = tuple(data.values())
 
@@ -100,82 +94,67 @@ def execute_insert(table: str, data: dict) -> bool:
             sql.SQL(', ').join(sql.Placeholder() * len(columns))
         )
 
-        cursor.execute(query, values)
-        conn.commit()
-        cursor.close()
-        conn.close()
+        with db_cursor() as cursor:
+            cursor.execute(query, values)
 
         logger.info(f"✓ Inserted into {table}")
         return True
 
     except Exception as e:
         logger.error(f"✗ Insert failed: {e}")
-        if conn:
-            conn.rollback()
-            conn.close()
         raise
 
 
 def execute_batch_insert(table: str, data_list: list, batch_size: int = 1000) -> int:
     """Batch insert multiple records."""
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
         if not data_list:
             return 0
 
-        columns = data_list[0].keys()
+        columns = list(data_list[0].keys())
         total_rows = 0
 
-        for i in range(0, len(data_list), batch_size):
-            batch = data_list[i:i+batch_size]
+        # Compose the statement once; execute_values expands VALUES %s
+        query = sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+            sql.Identifier(table),
+            sql.SQL(', ').join(map(sql.Identifier, columns))
+        )
+        row_values = itemgetter(*columns) if len(columns) > 1 else (
+            lambda data: (data[columns[0]],))
 
-            for data in batch:
-                values = tuple(data.values())
-                query = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
-                    sql.Identifier(table),
-                    sql.SQL(', ').join(map(sql.Identifier, columns)),
-                    sql.SQL(', ').join(sql.Placeholder() * len(columns))
-                )
-                cursor.execute(query, values)
+        # One commit for the whole insert instead of one WAL flush per batch
+        with db_cursor() as cursor:
+            for i in range(0, len(data_list), batch_size):
+                batch = data_list[i:i+batch_size]
 
-            conn.commit()
-            total_rows += len(batch)
-            logger.info(
-                f"✓ Batch inserted {len(batch)} rows - Total: {total_rows}")
+                # Generator of tuples in column order - no intermediate list
+                execute_values(cursor, query, map(row_values, batch),
+                               page_size=batch_size)
 
-        cursor.close()
-        conn.close()
+                total_rows += len(batch)
+                logger.info(
+                    f"✓ Batch inserted {len(batch)} rows - Total: {total_rows}")
 
         logger.info(f"✓ Batch insert complete - {total_rows} total rows")
         return total_rows
 
     except Exception as e:
         logger.error(f"✗ Batch insert failed: {e}")
-        if conn:
-            conn.rollback()
-            conn.close()
         raise
 
 
 def table_exists(table_name: str) -> bool:
     """Check if table exists in database."""
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT EXISTS(
-                SELECT 1 FROM information_schema.tables 
-                WHERE table_name = %s AND table_schema = 'public'
-            )
-        """, (table_name,))
+        with db_cursor() as cursor:
+            cursor.execute("""
+                SELECT EXISTS(
+                    SELECT 1 FROM information_schema.tables 
+                    WHERE table_name = %s AND table_schema = 'public'
+                )
+            """, (table_name,))
 
-        exists = cursor.fetchone()[0]
-        cursor.close()
-        conn.close()
+            exists = cursor.fetchone()[0]
 
         logger.info(f"✓ Table {table_name} exists: {exists}")
         return exists
@@ -188,13 +167,9 @@ def table_exists(table_name: str) -> bool:
 def get_row_count(table_name: str) -> int:
     """Get number of rows in table."""
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        count = cursor.fetchone()[0]
-        cursor.close()
-        conn.close()
+        with db_cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            count = cursor.fetchone()[0]
 
         logger.info(f"✓ {table_name}: {count} rows")
         return count
@@ -206,25 +181,141 @@ def get_row_count(table_name: str) -> int:
 
 def truncate_table(table_name: str) -> bool:
     """Truncate (clear) a table."""
-    conn = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
+    return truncate_tables(table_name)
 
-        cursor.execute(f"TRUNCATE TABLE {table_name} CASCADE")
-        conn.commit()
-        cursor.close()
-        conn.close()
 
-        logger.info(f"✓ Truncated {table_name}")
+def truncate_tables(*table_names: str) -> bool:
+    """
+    Truncate several tables in one statement and one transaction.
+
+    TRUNCATE takes the whole list at once, so CASCADE is resolved a single
+    time and either every table is cleared or none is.
+    """
+    try:
+        with db_cursor() as cursor:
+            cursor.execute(
+                f"TRUNCATE TABLE {', '.join(table_names)} CASCADE")
+
+        logger.info(f"✓ Truncated {', '.join(table_names)}")
         return True
 
     except Exception as e:
         logger.error(f"✗ Truncate failed: {e}")
-        if conn:
+        raise
+
+
+def vacuum_analyze(*table_names: str) -> None:
+    """
+    Run VACUUM (ANALYZE) on each table.
+
+    VACUUM cannot run inside a transaction block, so the pooled connection
+    is switched to autocommit for the duration and restored afterwards.
+    """
+    try:
+        with pooled_connection() as conn:
+            conn.autocommit = True
+            try:
+                cursor = conn.cursor()
+                for table_name in table_names:
+                    cursor.execute(f"VACUUM (ANALYZE) {table_name}")
+                cursor.close()
+            finally:
+                conn.autocommit = False
+
+        logger.info(f"✓ Vacuumed and analyzed {', '.join(table_names)}")
+
+    except Exception as e:
+        logger.error(f"✗ Vacuum failed: {e}")
+        raise
+
+
+# ========================================
+# CONNECTION POOL
+# ========================================
+
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """
+    Return the shared thread-safe connection pool, creating it on first use.
+
+    Raises:
+        OperationalError: If the initial connections cannot be established
+    """
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                try:
+                    db_config = get_db_config()
+                    _pool = ThreadedConnectionPool(
+                        Config.DB_POOL_MIN_CONN,
+                        Config.DB_POOL_MAX_CONN,
+                        **db_config
+                    )
+                    logger.info(
+                        f"✓ Connection pool ready for {db_config['database']}@{db_config['host']} "
+                        f"({Config.DB_POOL_MIN_CONN}-{Config.DB_POOL_MAX_CONN} connections)")
+                except OperationalError as e:
+                    logger.error(f"✗ Connection pool creation failed: {e}")
+                    raise
+
+    return _pool
+
+
+def put_connection(conn: psycopg2.extensions.connection, close: bool = False) -> None:
+    """Return a connection checked out with get_pool().getconn() to the pool."""
+    get_pool().putconn(conn, close=close)
+
+
+@contextmanager
+def pooled_connection() -> Iterator[psycopg2.extensions.connection]:
+    """
+    Check out a pooled connection for the duration of a with-block.
+
+    Uncommitted work is rolled back when the connection is returned, so
+    callers must commit explicitly.
+    """
+    conn = get_pool().getconn()
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
             conn.rollback()
-            conn.close()
         raise
+    finally:
+        put_connection(conn)
+
+
+@contextmanager
+def db_cursor() -> Iterator[psycopg2.extensions.cursor]:
+    """
+    Yield a cursor on a pooled connection.
+
+    The transaction is committed when the block exits normally and rolled
+    back if it raises; the connection then goes back to the pool.
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        finally:
+            cursor.close()
+
+
+def close_pool() -> None:
+    """Close every connection in the shared pool."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+            logger.info("✓ Connection pool closed")
 
 
 if __name__ == "__main__":